@@ -1,8 +1,11 @@
 import sys
+import pandas as pd
 from PyQt6.QtWidgets import QApplication
 from ui.main_window import MainWindow
 
 def main():
+    # Lets the table model hand out lazy copies instead of deep-copying the frame
+    pd.set_option("mode.copy_on_write", True)
     app = QApplication(sys.argv)
     window = MainWindow()
     window.show()
@@ -1,5 +1,6 @@
 import os
 import base64
+import threading
 from cryptography.fernet import Fernet
 
 # 1) For demonstration, you can do something like:
@@ -21,14 +22,28 @@ def get_fernet_key() -> bytes:
     else:
         return HARDCODED_KEY  # fallback
 
+# Fernet derives its signing/encryption keys on construction, so build it once
+# and only rebuild when the configured key changes.
+_FERNET = None
+_FERNET_KEY = None
+_FERNET_LOCK = threading.Lock()
+
+def _fernet() -> Fernet:
+    global _FERNET, _FERNET_KEY
+    key = get_fernet_key()
+    with _FERNET_LOCK:
+        if _FERNET is None or key != _FERNET_KEY:
+            _FERNET = Fernet(key)
+            _FERNET_KEY = key
+        return _FERNET
+
 def encrypt_value(plaintext: str) -> str:
     """
     Encrypts the plaintext using Fernet, returns a Base64-encoded ciphertext string.
     """
     if not plaintext:
         return ""
-    f = Fernet(get_fernet_key())
-    token = f.encrypt(plaintext.encode("utf-8"))
+    token = _fernet().encrypt(plaintext.encode("utf-8"))
     return token.decode("utf-8")  # store as string
 
 def decrypt_value(ciphertext: str) -> str:
@@ -39,8 +54,15 @@ def decrypt_value(ciphertext: str) -> str:
     if not ciphertext:
         return ""
     try:
-        f = Fernet(get_fernet_key())
-        plaintext_bytes = f.decrypt(ciphertext.encode("utf-8"))
+        plaintext_bytes = _fernet().decrypt(ciphertext.encode("utf-8"))
         return plaintext_bytes.decode("utf-8")
     except Exception:
         return ""
+
+
+# Warm up the OpenSSL backend and the cached Fernet instance at import time,
+# so the first settings read/write in the UI doesn't pay for it.
+try:
+    _fernet().encrypt(b"x")
+except Exception:
+    pass
@@ -2,7 +2,10 @@
 
 import re
 from typing import List, Dict, Tuple, Optional
-import urllib.parse
+from urllib.parse import quote
+import pandas as pd
+
+_EMAIL_RE = re.compile(r'[\w.-]+@[\w.-]+')
 
 def create_mailto_link(
     to_email: str,
@@ -21,16 +24,26 @@ def create_mailto_link(
     Returns:
         A formatted mailto: URL string
     """
-    # URL encode the parameters
-    params = {
-        'subject': subject,
-        'body': body
-    }
-    
-    query_string = urllib.parse.urlencode(params)
-    mailto_link = f"mailto:{to_email}?{query_string}"
-    
-    return mailto_link
+    # Percent-encode each field directly (RFC 6068 wants %20, not '+', for spaces)
+    return (
+        f"mailto:{quote(to_email, safe='@')}"
+        f"?subject={quote(subject, safe='')}&body={quote(body, safe='')}"
+    )
+
+def create_mailto_links(
+    to_emails: pd.Series,
+    subjects: pd.Series,
+    bodies: pd.Series
+) -> List[str]:
+    """
+    Build a mailto: link per row in one pass, e.g. to fill a column.
+    """
+    return [
+        create_mailto_link(str(to), str(subject), str(body))
+        for to, subject, body in zip(
+            to_emails.fillna(""), subjects.fillna(""), bodies.fillna("")
+        )
+    ]
 
 def send_email(
     to_email: str,
@@ -60,5 +73,11 @@ def extract_email_address(s: str) -> str:
     """Extract email address from a string containing potential formatting"""
     if not s:
         return ""
-    match = re.search(r'[\w\.-]+@[\w\.-]+', s)
-    return match.group(0).lower() if match else s.strip().lower()
\ No newline at end of file
+    match = _EMAIL_RE.search(s)
+    return match.group(0).lower() if match else s.strip().lower()
+
+def extract_email_addresses(series: pd.Series) -> pd.Series:
+    """Vectorized extract_email_address over a whole column"""
+    text = series.fillna("").astype(str)
+    found = text.str.extract(f"({_EMAIL_RE.pattern})", expand=False)
+    return found.fillna(text.str.strip()).str.lower()
@@ -1,31 +1,145 @@
 import os
+import shutil
+import tempfile
+from datetime import date, datetime
+import numpy as np
 import pandas as pd
 
+try:
+    import pyarrow as pa
+    _STRING_DTYPE = "string[pyarrow]"
+except ImportError:  # pyarrow is optional; fall back to pandas' own CSV engine
+    pa = None
+    _STRING_DTYPE = "string"
+
+try:
+    from python_calamine import CalamineWorkbook
+except ImportError:  # python-calamine is optional; fall back to openpyxl/xlrd
+    CalamineWorkbook = None
+
+def _read_csv(file_path: str) -> pd.DataFrame:
+    """Read a CSV with Arrow's multi-threaded parser when available."""
+    if pa is not None:
+        try:
+            return pd.read_csv(file_path, engine="pyarrow")
+        except Exception:
+            pass  # e.g. malformed rows the C parser tolerates
+    return pd.read_csv(file_path)
+
+def _excel_cell(value):
+    """Convert a calamine cell the way pandas' Excel readers do."""
+    if isinstance(value, float) and value.is_integer():
+        return int(value)  # Excel stores every number as a float
+    if isinstance(value, date) and not isinstance(value, datetime):
+        return pd.Timestamp(value)
+    return value
+
+def _header_names(header: list) -> list:
+    """
+    Name the header cells the way read_excel's parser does: blank cells
+    become "Unnamed: i" and repeats become X.1, X.2, ..., skipping names
+    already taken by another header, with named columns claimed first.
+    """
+    names = [name if name != "" else f"Unnamed: {i}" for i, name in enumerate(header)]
+    unnamed = [i for i, name in enumerate(header) if name == ""]
+    counts = {}
+    for i in [i for i in range(len(names)) if header[i] != ""] + unnamed:
+        name = base = names[i]
+        cur = counts.get(name, 0)
+        while cur > 0:
+            counts[base] = cur + 1
+            name = f"{base}.{cur}"
+            cur = cur + 1 if name in names else counts.get(name, 0)
+        names[i] = name
+        counts[name] = cur + 1
+    return names
+
+def _read_excel(file_path: str) -> pd.DataFrame:
+    """
+    Read the first sheet with calamine's Rust reader when available.
+    pandas 2.1 has no calamine engine for read_excel, so the rows are read
+    directly and shaped the way read_excel would return them.
+    """
+    if CalamineWorkbook is not None:
+        try:
+            # skip_empty_area=False keeps leading empty columns, as pandas does
+            sheet = CalamineWorkbook.from_path(file_path).get_sheet_by_index(0)
+            rows = sheet.to_python(skip_empty_area=False)
+        except Exception:
+            pass  # anything calamine can't parse goes through pandas
+        else:
+            # read_excel skips blank rows, including any above the header
+            rows = [
+                [_excel_cell(value) for value in row]
+                for row in rows
+                if any(value != "" for value in row)
+            ]
+            if not rows:
+                return pd.DataFrame()
+            header, body = rows[0], rows[1:]
+            columns = _header_names(header)
+            # calamine reports empty cells as ""; read_excel reports them as NaN
+            df = pd.DataFrame(body, columns=columns).replace("", np.nan)
+            return df.infer_objects()
+    return pd.read_excel(file_path)
+
 def load_data(file_path: str) -> pd.DataFrame:
     """
     Load data from CSV or Excel into a DataFrame.
     """
     ext = os.path.splitext(file_path)[1].lower()
     if ext == ".csv":
-        res =  pd.read_csv(file_path)
+        res = _read_csv(file_path)
     elif ext in [".xls", ".xlsx"]:
-        res =  pd.read_excel(file_path)
+        res = _read_excel(file_path)
     else:
         raise ValueError(f"Unsupported file format: {ext}")
     if '__Run_Row__' not in res.columns:
-        res.insert(0, '__Run_Row__', '')
+        # One Arrow string buffer rather than a Python object per row
+        res.insert(0, '__Run_Row__', pd.Series("", index=res.index, dtype=_STRING_DTYPE))
     return res
 
+# Read once at import (os.umask can only be read by setting it); new files
+# get the same mode open() would have given them
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
 def save_data(df: pd.DataFrame, file_path: str):
     """
     Save data to CSV or Excel, depending on the extension.
+    The file is written to a sibling temp file and atomically moved into
+    place, so an interrupted save never leaves a truncated file behind.
     """
     if '__Run_Row__' in df.columns:
         df = df.drop(columns=['__Run_Row__'])
     ext = os.path.splitext(file_path)[1].lower()
-    if ext == ".csv":
-        df.to_csv(file_path, index=False)
-    elif ext in [".xls", ".xlsx"]:
-        df.to_excel(file_path, index=False)
-    else:
+    if ext not in [".csv", ".xls", ".xlsx"]:
         raise ValueError(f"Unsupported file format for saving: {ext}")
+
+    # Write through symlinks to the real file rather than replacing the link
+    file_path = os.path.realpath(file_path)
+
+    # Keep the real extension last so to_excel still picks the right engine
+    fd, tmp_path = tempfile.mkstemp(
+        prefix=f".{os.path.basename(file_path)}.", suffix=f".tmp{ext}",
+        dir=os.path.dirname(os.path.abspath(file_path))
+    )
+    os.close(fd)
+    try:
+        if ext == ".csv":
+            # Always pandas' writer: Arrow's quotes every string and formats
+            # bools, floats and timestamps differently, so the saved file
+            # would depend on whether pyarrow is installed
+            df.to_csv(tmp_path, index=False)
+        else:
+            df.to_excel(tmp_path, index=False)
+        # mkstemp creates the file 0600; keep the permissions the user's file had
+        if os.path.exists(file_path):
+            shutil.copymode(file_path, tmp_path)
+        else:
+            os.chmod(tmp_path, 0o666 & ~_UMASK)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
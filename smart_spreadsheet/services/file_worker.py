@@ -0,0 +1,39 @@
+from PyQt6.QtCore import QObject, pyqtSignal, QRunnable
+from services.file_service import load_data, save_data
+
+
+class FileIOSignals(QObject):
+    """Signals for background file loads and saves"""
+    finished = pyqtSignal(str, object)  # file_path, loaded DataFrame (None for saves)
+    error = pyqtSignal(str, str)  # file_path, error_message
+
+
+class LoadFileWorker(QRunnable):
+    """Worker that reads a CSV/Excel file off the UI thread"""
+    def __init__(self, file_path):
+        super().__init__()
+        self.file_path = file_path
+        self.signals = FileIOSignals()
+
+    def run(self):
+        try:
+            df = load_data(self.file_path)
+            self.signals.finished.emit(self.file_path, df)
+        except Exception as e:
+            self.signals.error.emit(self.file_path, str(e))
+
+
+class SaveFileWorker(QRunnable):
+    """Worker that writes a snapshot of the DataFrame off the UI thread"""
+    def __init__(self, df, file_path):
+        super().__init__()
+        self.df = df
+        self.file_path = file_path
+        self.signals = FileIOSignals()
+
+    def run(self):
+        try:
+            save_data(self.df, self.file_path)
+            self.signals.finished.emit(self.file_path, None)
+        except Exception as e:
+            self.signals.error.emit(self.file_path, str(e))
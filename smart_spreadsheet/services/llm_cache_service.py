@@ -0,0 +1,60 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+try:
+    import diskcache
+except ImportError:  # diskcache is optional; fall back to an in-memory LRU
+    diskcache = None
+
+CACHE_DIR = ".llm_cache"
+CACHE_TTL_SECONDS = 24 * 60 * 60
+MEMORY_CACHE_SIZE = 512
+
+_cache = None
+_lock = threading.Lock()
+
+def cache_key(*parts) -> str:
+    """
+    Content-addressed key for an LLM request, e.g.
+    cache_key(provider, model, system_prompt, user_prompt, json_mode).
+    """
+    payload = json.dumps(parts, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def _get_cache():
+    global _cache
+    with _lock:
+        if _cache is None:
+            _cache = diskcache.Cache(CACHE_DIR) if diskcache is not None else OrderedDict()
+        return _cache
+
+def get_cached_response(key: str):
+    """Return the cached response for `key`, or None if missing or expired."""
+    cache = _get_cache()
+    if diskcache is not None:
+        return cache.get(key)
+    with _lock:
+        entry = cache.get(key)
+        if entry is None:
+            return None
+        response, expires_at = entry
+        if expires_at < time.time():
+            del cache[key]
+            return None
+        cache.move_to_end(key)
+        return response
+
+def set_cached_response(key: str, response: str):
+    """Store a successful response for CACHE_TTL_SECONDS."""
+    cache = _get_cache()
+    if diskcache is not None:
+        cache.set(key, response, expire=CACHE_TTL_SECONDS)
+        return
+    with _lock:
+        cache[key] = (response, time.time() + CACHE_TTL_SECONDS)
+        cache.move_to_end(key)
+        while len(cache) > MEMORY_CACHE_SIZE:
+            cache.popitem(last=False)
@@ -1,6 +1,11 @@
 import json
 import os
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib json module
+    orjson = None
+
 def load_metadata(csv_path: str) -> dict:
     """
     Given a CSV path like 'data.csv', look for 'data_metadata.json'.
@@ -10,6 +15,9 @@ def load_metadata(csv_path: str) -> dict:
     meta_path = f"{base}_metadata.json"
     if not os.path.exists(meta_path):
         return {}  # No metadata yet
+    if orjson is not None:
+        with open(meta_path, "rb") as f:
+            return orjson.loads(f.read())
     with open(meta_path, "r", encoding="utf-8") as f:
         return json.load(f)
 
@@ -19,6 +27,12 @@ def save_metadata(csv_path: str, metadata: dict):
     """
     base, ext = os.path.splitext(csv_path)
     meta_path = f"{base}_metadata.json"
+    if orjson is not None:
+        # OPT_NON_STR_KEYS: json.dump silently stringifies e.g. int row keys
+        data = orjson.dumps(metadata, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        with open(meta_path, "wb") as f:
+            f.write(data)
+        return
     with open(meta_path, "w", encoding="utf-8") as f:
         json.dump(metadata, f, indent=2)
 
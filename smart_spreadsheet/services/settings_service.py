@@ -1,5 +1,9 @@
 import os
 import json
+import hashlib
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 from PyQt6.QtCore import QSettings
 from .crypto_service import encrypt_value, decrypt_value
 from transformations.wiza_transformation import WizaAPI
@@ -12,8 +16,40 @@ ORGANIZATION_NAME = "MyCompany"
 APPLICATION_NAME = "MySmartApp"
 ENV_FILE_PATH = os.path.join(os.path.dirname(__file__), "..", ".env")
 
+# QSettings is reentrant but not thread-safe, so keep one handle per thread
+# (transformations read settings from the worker pool) instead of building
+# a new one, and re-reading the store, on every getter call.
+_SETTINGS = threading.local()
+
 def get_qsettings() -> QSettings:
-    return QSettings(ORGANIZATION_NAME, APPLICATION_NAME)
+    settings = getattr(_SETTINGS, "handle", None)
+    if settings is None:
+        settings = _SETTINGS.handle = QSettings(ORGANIZATION_NAME, APPLICATION_NAME)
+    return settings
+
+@contextmanager
+def batched_settings():
+    """
+    Group several setter calls into a single sync() of the settings store:
+
+        with batched_settings() as settings:
+            set_email_account(account, settings=settings)
+            set_email_password(password, settings=settings)
+    """
+    settings = get_qsettings()
+    try:
+        yield settings
+    finally:
+        settings.sync()
+
+def _store_value(key: str, value, settings: QSettings = None):
+    """setValue and sync right away, unless writing into a batched_settings() block"""
+    if settings is not None:
+        settings.setValue(key, value)
+        return
+    settings = get_qsettings()
+    settings.setValue(key, value)
+    settings.sync()
 
 # -------------------------------
 # User Info Functions
@@ -33,80 +69,163 @@ def save_user_info(linkedin_url):
     except Exception as e:
         print(f"Error saving user info: {e}")
 
-def ensure_resume_json_exists():
+# resume.json is produced by a slow LLM call, so saving the resume only
+# schedules the conversion; readers wait for it in get_resume_json().
+_RESUME_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="resume-json")
+_RESUME_JSON_LOCK = threading.RLock()
+_resume_json_future = None
+# Bumped on every resume change, so a conversion of older text doesn't overwrite newer
+_resume_generation = 0
+_pending_resume_text = None  # text the in-flight conversion was started for
+
+RESUME_JSON_PATH = os.path.join(os.path.dirname(__file__), "resume.json")
+RESUME_SCHEMA_PATH = os.path.join(os.path.dirname(__file__), "resumeJSONSchema.json")
+# Digest of the (resume text, schema) pair resume.json was generated from
+RESUME_HASH_PATH = RESUME_JSON_PATH + ".hash"
+
+_schema_cache = (None, None)  # (mtime_ns, text)
+
+def _read_resume_schema() -> str:
+    """Return the resume JSON schema, re-reading it only when the file changes"""
+    global _schema_cache
+    mtime = os.stat(RESUME_SCHEMA_PATH).st_mtime_ns
+    if _schema_cache[0] != mtime:
+        with open(RESUME_SCHEMA_PATH, "r", encoding="utf-8") as f:
+            _schema_cache = (mtime, f.read())
+    return _schema_cache[1]
+
+def _resume_hash(resume_text: str, schema_text: str) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    h.update(resume_text.encode("utf-8"))
+    h.update(b"\0")
+    h.update(schema_text.encode("utf-8"))
+    return h.hexdigest()
+
+def _resume_json_is_current(resume_text: str) -> bool:
+    """True if resume.json was generated from this exact text and schema"""
+    try:
+        with open(RESUME_HASH_PATH, "r", encoding="utf-8") as f:
+            stored = f.read().strip()
+        return os.path.exists(RESUME_JSON_PATH) and stored == _resume_hash(resume_text, _read_resume_schema())
+    except OSError:
+        return False
+
+def _checked_json(text: str) -> str:
+    """Return `text` unchanged if it parses as JSON; raise ValueError otherwise"""
+    json.loads(text)
+    return text
+
+def ensure_resume_json_exists(resume_text=None, refresh_cache=False):
     """Ensure resume.json exists by converting from resume.txt if needed"""
-    json_path = os.path.join(os.path.dirname(__file__), "resume.json")
+    return _ensure_resume_json_exists(resume_text, refresh_cache)
+
+def _ensure_resume_json_exists(resume_text=None, refresh_cache=False):
+    json_path = RESUME_JSON_PATH
     
-    if not os.path.exists(json_path):
-        resume_text = get_resume_text()
+    # The lock only covers the file checks and writes, never the LLM call,
+    # so saving settings on the UI thread can't wait on a conversion
+    with _RESUME_JSON_LOCK:
+        if os.path.exists(json_path):
+            return True
+        if resume_text is None:
+            resume_text = get_resume_text()
         if not resume_text:
             return False
-            
-        try:
-            # Create LLM transformation instance
-            llm = MultiLLMTransformation()
-            
-            # Load JSON schema
-            schema_path = os.path.join(os.path.dirname(__file__), "resumeJSONSchema.json")
-            with open(schema_path, "r", encoding="utf-8") as f:
-                resume_format = f.read()
-            
-            # Prepare prompts
-            system_prompt = "You are a resume parsing expert."
-            user_prompt = (
-                "Convert this text extracted from my resume to resumeJSON.\n"
-                "----MY RESUME TEXT----\n{text}\n----------------------\n"
-                "Respond with it in the following JSON format:\n"
-                "----RESUME JSON FORMAT----\n{format}\n--------------------------\n"
-                "Rules:\n"
-                "1. If there is no information matching the field or it's not in the right format "
-                "(e.g. date in YYYY-MM-DD), don't include the field.\n"
-                "2. You MUST respond with the entire field's text if it is in the right format.\n"
-                "3. Conform the existing information to the JSON format, to make sure as much information as possible is included.\n"
-                "Respond with just the JSON."
-            ).format(text=resume_text, format=resume_format)
-            
-            # Call LLM
-            resume_json_str = llm._call_llm(
-                provider="openai",
-                model_name="gpt-4o-mini",
-                system_prompt=system_prompt,
-                user_prompt=user_prompt,
-                json_mode=True
-            )
+        generation = _resume_generation
+        
+    try:
+        # Create LLM transformation instance
+        llm = MultiLLMTransformation()
+        
+        # Load JSON schema
+        resume_format = _read_resume_schema()
+        
+        # Prepare prompts
+        system_prompt = "You are a resume parsing expert."
+        user_prompt = (
+            "Convert this text extracted from my resume to resumeJSON.\n"
+            "----MY RESUME TEXT----\n{text}\n----------------------\n"
+            "Respond with it in the following JSON format:\n"
+            "----RESUME JSON FORMAT----\n{format}\n--------------------------\n"
+            "Rules:\n"
+            "1. If there is no information matching the field or it's not in the right format "
+            "(e.g. date in YYYY-MM-DD), don't include the field.\n"
+            "2. You MUST respond with the entire field's text if it is in the right format.\n"
+            "3. Conform the existing information to the JSON format, to make sure as much information as possible is included.\n"
+            "Respond with just the JSON."
+        ).format(text=resume_text, format=resume_format)
+        
+        # Call LLM
+        resume_json_str = llm._call_llm(
+            provider="openai",
+            model_name="gpt-4o-mini",
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+            json_mode=True,
+            refresh_cache=refresh_cache,
+            # Invalid JSON is neither cached nor written to resume.json
+            parse=_checked_json
+        )
+        
+        with _RESUME_JSON_LOCK:
+            # The resume was saved again mid-conversion; the job scheduled by
+            # that save writes the JSON for the newer text
+            if generation != _resume_generation:
+                return False
             
             # Save JSON
             with open(json_path, "w", encoding="utf-8") as f:
                 f.write(resume_json_str)
-                
-            return True
+            with open(RESUME_HASH_PATH, "w", encoding="utf-8") as f:
+                f.write(_resume_hash(resume_text, resume_format))
             
-        except Exception as e:
-            print(f"Error converting resume to JSON: {e}")
-            return False
-    
-    return True
+        return True
+        
+    except Exception as e:
+        print(f"Error converting resume to JSON: {e}")
+        return False
 
 def save_user_resume(resume_text):
-    """Save resume text to file and update JSON"""
-    # Save to text file
-    with open('user_resume.txt', 'w', encoding='utf-8') as f:
-        f.write(resume_text)
-    
-    # Force regeneration of JSON
-    json_path = os.path.join(os.path.dirname(__file__), "resume.json")
-    if os.path.exists(json_path):
-        os.remove(json_path)
-    
-    # Generate new JSON
-    ensure_resume_json_exists()
+    """Save resume text to file and regenerate the JSON in the background"""
+    global _resume_json_future, _resume_generation, _pending_resume_text
+    with _RESUME_JSON_LOCK:
+        # Save to text file
+        with open('user_resume.txt', 'w', encoding='utf-8') as f:
+            f.write(resume_text)
+
+        # Unchanged text and schema: the existing JSON is still valid
+        if _resume_json_is_current(resume_text):
+            return
+
+        # Same text as the conversion already running: let it finish
+        pending = _resume_json_future
+        if pending is not None and not pending.done() and _pending_resume_text == resume_text:
+            return
+
+        # Force regeneration of JSON
+        if os.path.exists(RESUME_JSON_PATH):
+            os.remove(RESUME_JSON_PATH)
+        _resume_generation += 1
+        _pending_resume_text = resume_text
+
+    # Generate new JSON without blocking the caller. The text is passed in
+    # because this thread's QSettings may not be synced yet. An explicit
+    # save asks the model again rather than replaying a cached conversion.
+    _resume_json_future = _RESUME_EXECUTOR.submit(ensure_resume_json_exists, resume_text, True)
 
 def get_resume_json():
     """Get the resume JSON data, converting from text if needed"""
-    if ensure_resume_json_exists():
-        json_path = os.path.join(os.path.dirname(__file__), "resume.json")
-        with open(json_path, "r", encoding="utf-8") as f:
-            return json.load(f)
+    global _resume_json_future
+    pending = _resume_json_future
+    if pending is not None:
+        pending.result()  # ensure_resume_json_exists never raises
+        if _resume_json_future is pending:
+            _resume_json_future = None
+    if _ensure_resume_json_exists():
+        with _RESUME_JSON_LOCK:
+            if os.path.exists(RESUME_JSON_PATH):
+                with open(RESUME_JSON_PATH, "r", encoding="utf-8") as f:
+                    return json.load(f)
     return None
 
 # -------------------------------
@@ -117,41 +236,32 @@ def get_linkedin_url() -> str:
     settings = get_qsettings()
     return settings.value("user/linkedin_url", "", type=str)
 
-def set_linkedin_url(url: str):
-    settings = get_qsettings()
-    settings.setValue("user/linkedin_url", url)
-    settings.sync()
+def set_linkedin_url(url: str, settings: QSettings = None):
+    _store_value("user/linkedin_url", url, settings)
     save_user_info(url)  # Automatically trigger Wiza save
 
 def get_resume_text() -> str:
     settings = get_qsettings()
     return settings.value("user/resume_text", "", type=str)
 
-def set_resume_text(text: str):
-    settings = get_qsettings()
-    settings.setValue("user/resume_text", text)
-    settings.sync()
+def set_resume_text(text: str, settings: QSettings = None):
+    _store_value("user/resume_text", text, settings)
     save_user_resume(text)  # Automatically save resume text
 
 def get_email_account() -> str:
     settings = get_qsettings()
     return settings.value("email/account", "", type=str)
 
-def set_email_account(account: str):
-    settings = get_qsettings()
-    settings.setValue("email/account", account)
-    settings.sync()
+def set_email_account(account: str, settings: QSettings = None):
+    _store_value("email/account", account, settings)
 
 def get_email_password() -> str:
     settings = get_qsettings()
     encrypted = settings.value("email/password", "", type=str)
     return decrypt_value(encrypted)
 
-def set_email_password(password: str):
-    settings = get_qsettings()
-    encrypted = encrypt_value(password)
-    settings.setValue("email/password", encrypted)
-    settings.sync()
+def set_email_password(password: str, settings: QSettings = None):
+    _store_value("email/password", encrypt_value(password), settings)
 
 # -------------------------------
 # ENV (.env) FUNCTIONS
@@ -0,0 +1,11 @@
+import os
+import sys
+
+import pandas as pd
+
+# The app imports its packages (ui, services, transformations) relative to
+# smart_spreadsheet/, which is where app.py runs from
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+# Same as app.py
+pd.set_option("mode.copy_on_write", True)
@@ -0,0 +1,59 @@
+import pandas as pd
+import pytest
+
+pytest.importorskip("PyQt6")
+
+from ui.data_frame_model import DataFrameModel
+
+
+def _column_text(model, col):
+    return [model.data(model.index(row, col)) for row in range(model.rowCount())]
+
+
+def test_insert_rows_keeps_int_and_bool_columns():
+    model = DataFrameModel(pd.DataFrame({"a": [1, 2], "d": [True, False]}))
+
+    assert model.insertRows(2, 1)
+
+    df = model.dataFrameView()
+    assert df["a"].dtype == "Int64"
+    assert df["d"].dtype == "boolean"
+    assert _column_text(model, 0) == ["1", "2", ""]
+    assert _column_text(model, 1) == ["True", "False", ""]
+
+
+def test_set_data_refuses_unparseable_bool_edit():
+    model = DataFrameModel(pd.DataFrame({"d": ["true", "false"]}))
+    model.changeColumnDtype(0, "bool")
+
+    assert not model.setData(model.index(0, 0), "garbage")
+    assert model.dataFrameView()["d"].tolist() == [True, False]
+
+    assert model.setData(model.index(1, 0), "true")
+    assert model.setData(model.index(0, 0), "")
+    assert _column_text(model, 0) == ["", "True"]
+
+
+def test_int_column_conversion_does_not_downcast():
+    model = DataFrameModel(pd.DataFrame({"a": ["1", "2"]}))
+    model.changeColumnDtype(0, "int")
+
+    assert model.dataFrameView()["a"].dtype == "Int64"
+    assert model.setData(model.index(0, 0), "500")
+    assert model.dataFrameView()["a"].dtype == "Int64"
+    assert _column_text(model, 0) == ["500", "2"]
+
+
+def test_set_data_frame_keeps_fetched_rows_for_same_table():
+    model = DataFrameModel()
+    model.FETCH_CHUNK = 2
+    model.setDataFrame(pd.DataFrame({"a": range(5)}))
+    model.fetchMore()
+    assert model.rowCount() == 4
+
+    # A transformation result: same rows, one more column
+    model.setDataFrame(pd.DataFrame({"a": range(5), "b": range(5)}))
+    assert model.rowCount() == 4
+
+    model.setDataFrame(pd.DataFrame({"a": range(3)}))
+    assert model.rowCount() == 2
@@ -0,0 +1,25 @@
+import numpy as np
+import pandas as pd
+
+from services.file_service import _header_names, save_data
+
+
+def test_saved_csv_matches_to_csv(tmp_path):
+    df = pd.DataFrame({
+        "text": ["a", "b,c", None],
+        "int": [1, 2, 3],
+        "float": [1.0, 2.5, np.nan],
+        "bool": [True, False, True],
+        "when": pd.to_datetime(["2024-01-01", "2024-01-02 03:04:05", None], format="mixed"),
+    })
+    path = tmp_path / "out.csv"
+
+    save_data(df, str(path))
+
+    assert path.read_text() == df.to_csv(index=False)
+
+
+def test_header_names_match_read_excel_mangling():
+    # A repeat skips names another header already uses
+    assert _header_names(["a", "a.1", "a"]) == ["a", "a.1", "a.2"]
+    assert _header_names(["x", "", "x", ""]) == ["x", "Unnamed: 1", "x.1", "Unnamed: 3"]
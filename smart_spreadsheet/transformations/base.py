@@ -1,20 +1,86 @@
 from abc import ABC, abstractmethod
+from collections import ChainMap
+from functools import lru_cache
 from string import Template
 import os
-from typing import Union, Optional
-from PyQt6.QtWidgets import QWidget
+from typing import TYPE_CHECKING, Union, Optional
+
+if TYPE_CHECKING:
+    # Only for annotations: headless use of transformations shouldn't load Qt
+    from PyQt6.QtWidgets import QWidget
+
+# Abstract base only; lets discovery skip importing this module
+TRANSFORMATION_NAMES = ()
 
 class SafeTemplate(Template):
+    # `braced` and `invalid` are required by Template but never match: a
+    # second copy of `named` only cost a failed alternative per '{{', and an
+    # empty `invalid` turned any stray '{{' (e.g. JSON in a prompt) into an
+    # error that left the whole prompt unsubstituted. Stray '{{' now stay literal.
     delimiter = '{{'
     pattern = r'''
     \{\{(?:
     (?P<escaped>\{\{)|
     (?P<named>[_a-z][_a-z0-9]*)\}\}|
-    (?P<braced>[_a-z][_a-z0-9]*)\}\}|
-    (?P<invalid>)
+    (?P<braced>(?!))|
+    (?P<invalid>(?!))
     )
     '''
 
+def _escape_braces(text):
+    return text.replace('{', '{{').replace('}', '}}')
+
+@lru_cache(maxsize=128)
+def _compile_template(text):
+    """
+    Translate a {{placeholder}} prompt into the equivalent str.format string,
+    once per distinct text, so each row is a single C-level format_map call.
+    """
+    parts = []
+    pos = 0
+    # Template compiles `pattern` on the class, so this parses exactly as it would
+    for m in SafeTemplate.pattern.finditer(text):
+        parts.append(_escape_braces(text[pos:m.start()]))
+        if m.group('escaped') is not None:
+            parts.append('{{{{')
+        else:
+            parts.append('{' + m.group('named') + '}')
+        pos = m.end()
+    parts.append(_escape_braces(text[pos:]))
+    return ''.join(parts)
+
+@lru_cache(maxsize=128)
+def _has_placeholders(text):
+    """False for constant prompts, which can skip substitution entirely."""
+    return SafeTemplate.pattern.search(text) is not None
+
+@lru_cache(maxsize=8)
+def _assemble_system_prompt(base_prompt, user_template, user_few_shot):
+    """
+    Append the user's template and few-shot examples to a system prompt.
+    Cached, since the settings rarely change between transforms; the same
+    string object also keeps the per-text template caches warm.
+    """
+    if user_template:
+        base_prompt = base_prompt.strip() + "\n\n" + f"Here is the template you should follow: {user_template.strip()}\n\n"
+    if user_few_shot:
+        base_prompt = base_prompt.strip() + "\n\n" + f"Here are some examples of messages that worked in the past: {user_few_shot.strip()}"
+    return base_prompt
+
+@lru_cache(maxsize=16)
+def _read_text(path, mtime_ns, size):
+    # mtime_ns and size are only part of the cache key, so an edited file is re-read
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+def _read_optional_text(path):
+    """Contents of `path`, or None if it doesn't exist."""
+    try:
+        st = os.stat(path)
+        return _read_text(path, st.st_mtime_ns, st.st_size)
+    except OSError:
+        return None
+
 class BaseTransformation(ABC):
     """
     Abstract base class for transformations with enhanced placeholder support
@@ -22,6 +88,9 @@ class BaseTransformation(ABC):
     name = "Base Transformation"
     description = "A base class for transformations"
     predefined_output = False  # Add this class variable
+    # True for transformations whose transform() accepts refresh_cache=True
+    # to skip the LLM response cache on explicit re-runs
+    uses_response_cache = False
 
     @abstractmethod
     def transform(self, df, output_col_name, *args):
@@ -40,9 +109,9 @@ class BaseTransformation(ABC):
     @classmethod
     def get_placeholder_wrapper(cls, extra_placeholders=None):
         """
-        Returns a function that, given `text` and a row (a Series),
-        will merge:
-          1) row data (row.to_dict())
+        Returns a function that, given `text` and a row (a Series, or a dict
+        of {column: value} the caller already built for the row), will merge:
+          1) row data
           2) user_info.txt content (if not already present)
           3) user_resume.txt content (if not already present)
           4) `extra_placeholders` (any transformation-specific placeholders)
@@ -55,29 +124,28 @@ class BaseTransformation(ABC):
         if extra_placeholders is None:
             extra_placeholders = {}
 
+        # Read the user files once per wrapper, not once per row
+        user_context = {}
+        user_info = _read_optional_text('user_info.txt')
+        if user_info is not None:
+            user_context['user_info'] = user_info
+        user_resume = _read_optional_text('user_resume.txt')
+        if user_resume is not None:
+            user_context['user_resume'] = user_resume
+
         def replace_placeholders(text, row):
+            if not _has_placeholders(text):
+                return text
             try:
                 # 1) Gather row data
-                context = row.to_dict()
-
-                # 2) Add user_info if not in row
-                if 'user_info' not in context:
-                    if os.path.exists('user_info.txt'):
-                        with open('user_info.txt', 'r', encoding='utf-8') as f:
-                            context['user_info'] = f.read()
-                
-                # 3) Add resume if not in row
-                if 'user_resume' not in context:
-                    if os.path.exists('user_resume.txt'):
-                        with open('user_resume.txt', 'r', encoding='utf-8') as f:
-                            context['user_resume'] = f.read()
-
-                # 4) Merge in any extra placeholders from the transformation
-                for key, val in extra_placeholders.items():
-                    context[key] = val
+                row_context = row if isinstance(row, dict) else row.to_dict()
+
+                # 2-4) Extra placeholders win, then the row, then the user files.
+                # The shared dicts are chained rather than copied into every row.
+                context = ChainMap(extra_placeholders, row_context, user_context)
 
                 # 5) Perform substitution
-                return SafeTemplate(text).substitute(**context)
+                return _compile_template(text).format_map(context)
             except Exception as e:
                 print(f"Placeholder substitution error: {e}")
                 return text
@@ -91,7 +159,7 @@ class BaseTransformation(ABC):
         """
         return False
 
-    def create_settings_widget(self, parent=None) -> Optional[QWidget]:
+    def create_settings_widget(self, parent=None) -> Optional["QWidget"]:
         """
         Return a QWidget that holds custom settings fields (e.g. QLineEdit, QTextEdit).
         The host dialog will embed it in a 'Transformations' settings tab.
@@ -2,9 +2,27 @@
 
 import json
 import re
-import os
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QPlainTextEdit
-from .llm_transformation import MultiLLMTransformation
+from .base import _assemble_system_prompt, _read_optional_text
+from .llm_transformation import MultiLLMTransformation, DEFAULT_MAX_WORKERS
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib json module
+    orjson = None
+
+TRANSFORMATION_NAMES = ("Professional Follow-Up Emails",)
+
+def _json_loads(text):
+    return orjson.loads(text) if orjson is not None else json.loads(text)
+
+def _json_dumps(obj):
+    return orjson.dumps(obj).decode("utf-8") if orjson is not None else json.dumps(obj)
+
+def _parse_emails(response):
+    """Both emails from the LLM's JSON response; raises if either is missing"""
+    email_data = _json_loads(response)
+    return _json_dumps(email_data["email1"]), _json_dumps(email_data["email2"])
 
 class FollowUpEmailTransformation(MultiLLMTransformation):
     name = "Professional Follow-Up Emails"
@@ -25,19 +43,16 @@ class FollowUpEmailTransformation(MultiLLMTransformation):
         """
         widget = QWidget(parent)
         layout = QVBoxLayout(widget)
+        data = self.load_custom_settings()
 
         layout.addWidget(QLabel("Follow-Up Email Template:"))
         self.template_edit = QPlainTextEdit()
-        self.template_edit.setPlainText(
-            self.load_custom_settings().get("template", "")
-        )
+        self.template_edit.setPlainText(data.get("template", ""))
         layout.addWidget(self.template_edit)
 
         layout.addWidget(QLabel("Few-Shot Examples (optional):"))
         self.few_shot_edit = QPlainTextEdit()
-        self.few_shot_edit.setPlainText(
-            self.load_custom_settings().get("few_shot", "")
-        )
+        self.few_shot_edit.setPlainText(data.get("few_shot", ""))
         layout.addWidget(self.few_shot_edit)
 
         return widget
@@ -46,17 +61,12 @@ class FollowUpEmailTransformation(MultiLLMTransformation):
         """
         Reads the template & few-shot text from local files (or you could
         store them in QSettings/JSON). Returns a dict with 'template'/'few_shot'.
+        Reads are cached until the files change on disk.
         """
-        data = {"template": "", "few_shot": ""}
-        if os.path.exists(self._template_file):
-            with open(self._template_file, "r", encoding="utf-8") as f:
-                data["template"] = f.read()
-
-        if os.path.exists(self._few_shot_file):
-            with open(self._few_shot_file, "r", encoding="utf-8") as f:
-                data["few_shot"] = f.read()
-
-        return data
+        return {
+            "template": _read_optional_text(self._template_file) or "",
+            "few_shot": _read_optional_text(self._few_shot_file) or "",
+        }
 
     def save_custom_settings(self, widget_data: dict):
         """
@@ -97,6 +107,11 @@ class FollowUpEmailTransformation(MultiLLMTransformation):
                 "name": "api_key",
                 "type": "text",
                 "description": "API key (leave blank for environment variable)"
+            },
+            {
+                "name": "max_workers",
+                "type": "text",
+                "description": f"Parallel LLM requests (default {DEFAULT_MAX_WORKERS})"
             }
         ]
 
@@ -135,13 +150,10 @@ class FollowUpEmailTransformation(MultiLLMTransformation):
     }"""
 
 
-        user_prompt = """Generate two follow-up emails for {{Hiring_Manager_Name}} at {{CompanyName}}:
-
-            Context:
-            - Position: {{Job_Title}} (ID: {{Job_ID}})
-            - Job Description: {{Job_Description}}
-            - My Background and resume (use my name for signature): {{user_resume}} -
-            - Linkedin Connection Message: {{LinkedIn_Intro}}
+        # Fixed instructions first, then the resume (same for every row), then
+        # the row's own details, so rows share the longest possible prompt
+        # prefix for the providers' prompt caching
+        user_prompt = """Generate two follow-up emails using the context below.
 
             Email 1 (1-week follow-up):
             - Purpose: Enthusiastic check-in
@@ -152,38 +164,43 @@ class FollowUpEmailTransformation(MultiLLMTransformation):
             - Include: Relevant new achievement from resume, specific role fit
 
             Separate emails with ===EMAIL2===
-            NO markdown, use proper email formatting"""
+            NO markdown, use proper email formatting
+
+            Context:
+            - My Background and resume (use my name for signature): {{user_resume}} -
+            - Recipient: {{Hiring_Manager_Name}} at {{CompanyName}}
+            - Position: {{Job_Title}} (ID: {{Job_ID}})
+            - Job Description: {{Job_Description}}
+            - Linkedin Connection Message: {{LinkedIn_Intro}}"""
 
-        if user_template:
-            base_system_prompt = base_system_prompt.strip() + "\n\n" + f"Here is the template you should follow: {user_template.strip()}\n\n"
-        if user_few_shot:
-            base_system_prompt = base_system_prompt.strip() + "\n\n" + f"Here are some examples of messages that worked in the past: {user_few_shot.strip()}"
+        base_system_prompt = _assemble_system_prompt(base_system_prompt, user_template, user_few_shot)
 
         # Initialize LLM clients
         self._init_clients()
         placeholder_wrapper = self.get_placeholder_wrapper()
 
-        # Process row by row
-        for idx, row in df.iterrows():
+        provider = kwargs.get("provider", "OpenAI").strip().lower()
+        model_name = kwargs.get("model", "gpt-4o-mini").strip()
+        refresh_cache = kwargs.get("refresh_cache", False)
+
+        # Fill the prompts up front; only the LLM calls run on the pool.
+        # Each row's dict is built once and shared by both prompts.
+        prompts = [
+            (placeholder_wrapper(base_system_prompt, row), placeholder_wrapper(user_prompt, row))
+            for row in df.to_dict("records")
+        ]
+
+        def generate(prompt_pair):
             try:
-                final_system = placeholder_wrapper(base_system_prompt, row)
-                final_user = placeholder_wrapper(user_prompt, row)
-
-                # Generate emails using LLM
-                response = self._call_llm(
-                    kwargs.get("provider", "OpenAI").strip().lower(),
-                    kwargs.get("model", "gpt-4o-mini").strip(),
-                    final_system,
-                    final_user
-                )
-
-                # Parse JSON response
-                email_data = json.loads(response)
-                df.at[idx, "FollowUp_Email_1"] = json.dumps(email_data["email1"])
-                df.at[idx, "FollowUp_Email_2"] = json.dumps(email_data["email2"])
-                
+                # Generate emails using LLM; only parseable responses are cached
+                return self._call_llm(provider, model_name, *prompt_pair, refresh_cache=refresh_cache,
+                                      parse=_parse_emails)
             except Exception as e:
-                df.at[idx, "FollowUp_Email_1"] = f"ERROR: {e}"
-                df.at[idx, "FollowUp_Email_2"] = f"ERROR: {e}"
+                return f"ERROR: {e}", f"ERROR: {e}"
+
+        # Results come back in row order; each output column is written once
+        results = self._map_concurrently(generate, prompts, kwargs.get("max_workers"))
 
+        df["FollowUp_Email_1"] = [email1 for email1, _ in results]
+        df["FollowUp_Email_2"] = [email2 for _, email2 in results]
         return df
@@ -1,9 +1,33 @@
 # transformations/linkedin_message.py
 
-from .llm_transformation import MultiLLMTransformation
-import os
+import re
+from .base import _assemble_system_prompt, _read_optional_text
+from .llm_transformation import MultiLLMTransformation, DEFAULT_MAX_WORKERS
+from services.llm_cache_service import cache_key, get_cached_response, set_cached_response
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QPlainTextEdit
 
+TRANSFORMATION_NAMES = ("LinkedIn Intro Message",)
+
+# A 300-character message is ~75 tokens; the cap leaves room for the model to
+# finish a message that's somewhat long (it gets shortened afterwards) while
+# stopping runaway generations early
+MESSAGE_MAX_TOKENS = 150
+SHORTEN_MAX_TOKENS = 120
+
+# Wording-only shortenings tried before spending an LLM call on a message
+# that is just over the limit
+_TRIM_REPLACEMENTS = (
+    (re.compile(r"[ \t]+"), " "),
+    (re.compile(r" *\n\s*"), "\n"),
+    (re.compile(r"[\u2018\u2019]"), "'"),
+    (re.compile(r"[\u201c\u201d]"), '"'),
+    (re.compile(r"\bI am\b"), "I'm"),
+    (re.compile(r"\bI would\b"), "I'd"),
+    (re.compile(r"\bI have\b"), "I've"),
+    (re.compile(r"\bdo not\b"), "don't"),
+    (re.compile(r"\bThank you\b"), "Thanks"),
+)
+
 class LinkedInMessageTransformation(MultiLLMTransformation):
     name = "LinkedIn Intro Message"
     description = "Generates sub-300char LinkedIn intro with required elements."
@@ -12,6 +36,12 @@ class LinkedInMessageTransformation(MultiLLMTransformation):
     _template_file = "linkedin_template.txt"
     _examples_file = "linkedin_few_shot.txt"
 
+    # Moving average of len(response) / len(user prompt), learned from the
+    # first responses; used to warn the model up front when a prompt is
+    # likely to come back too long, instead of paying for a shortening retry
+    _expansion_ratio = None
+    _LENGTH_DIRECTIVE = "\nCRITICAL: Response MUST be 290 characters or fewer."
+
     def required_static_params(self):
         return [
             {
@@ -32,6 +62,11 @@ class LinkedInMessageTransformation(MultiLLMTransformation):
                 "name": "api_key",
                 "type": "text",
                 "description": "API key (leave blank for environment variable)"
+            },
+            {
+                "name": "max_workers",
+                "type": "text",
+                "description": f"Parallel LLM requests (default {DEFAULT_MAX_WORKERS})"
             }
         ]
 
@@ -55,11 +90,10 @@ class LinkedInMessageTransformation(MultiLLMTransformation):
             - Be on a 6th grade reading level and sound like an feeling person
             - NO markdown/placeholders
         """
-        base_user_prompt = """Create LinkedIn message for {{Hiring_Manager_Name}} at {{CompanyName}}:
-            Job Title: {{Job_Title}} (ID: {{Job_ID}})
-            Job Requirements: {{Job_Description}}
-            My Resume Highlights: {{user_resume}}
-            Their Profile: {{LinkedIn_Summary}}
+        # Fixed instructions first, then the resume (same for every row), then
+        # the row's own details, so rows share the longest possible prompt
+        # prefix for the providers' prompt caching
+        base_user_prompt = """Create a LinkedIn message using the context below.
             My name you can find in the resume.
 
             Include:
@@ -68,49 +102,85 @@ class LinkedInMessageTransformation(MultiLLMTransformation):
             3. Top relevant skill from my resume
             4. Connection request
             5. Signature 
+
+            My Resume Highlights: {{user_resume}}
+
+            Recipient: {{Hiring_Manager_Name}} at {{CompanyName}}
+            Job Title: {{Job_Title}} (ID: {{Job_ID}})
+            Job Requirements: {{Job_Description}}
+            Their Profile: {{LinkedIn_Summary}}
         """
 
         # 3) Merge user-provided text with base prompts:
         #    - Example: prepend the user template to the system prompt
         #               prepend the few-shot examples to the user prompt
-        if user_template:
-            base_system_prompt = base_system_prompt.strip() + "\n\n" + f"Here is the template you should follow: {user_template.strip()}\n\n"
-        if user_few_shot:
-            base_system_prompt = base_system_prompt.strip() + "\n\n" + f"Here are some examples of messages that worked in the past: {user_few_shot.strip()}"
+        base_system_prompt = _assemble_system_prompt(base_system_prompt, user_template, user_few_shot)
 
         # 4) Set up LLM call parameters
         provider = kwargs.get("provider", "OpenAI").strip().lower()
         model_name = kwargs.get("model", "gpt-4o-mini").strip()
+        refresh_cache = kwargs.get("refresh_cache", False)
 
         self._init_clients()
         placeholder_wrapper = self.get_placeholder_wrapper()
 
         # 5) For each row, do placeholder substitution, then generate the message
-        for idx, row in df.iterrows():
-            try:
-                final_system = placeholder_wrapper(base_system_prompt, row)
-                final_user = placeholder_wrapper(base_user_prompt, row)
+        jobs = [
+            (placeholder_wrapper(base_system_prompt, row), placeholder_wrapper(base_user_prompt, row))
+            for row in df.to_dict("records")
+        ]
 
-                response = self._generate_with_retries(
-                    provider, model_name, final_system, final_user
+        def process(job):
+            final_system, final_user = job
+            try:
+                return self._generate_with_retries(
+                    provider, model_name, final_system, final_user, refresh_cache=refresh_cache
                 )
-                df.at[idx, output_col_name] = response
             except Exception as e:
-                df.at[idx, output_col_name] = f"ERROR: {e}"
+                return f"ERROR: {e}"
+
+        # Results come back in row order, so the column is written once
+        df[output_col_name] = self._map_concurrently(process, jobs, kwargs.get("max_workers"))
 
         return df
 
-    def _generate_with_retries(self, provider, model, system_prompt, user_prompt, max_attempts=3):
+    def _generate_with_retries(self, provider, model, system_prompt, user_prompt, max_attempts=3, refresh_cache=False):
         """
         Calls LLM, checks length, and tries to shorten if >300 characters.
+        The finished message is cached per prompt rather than each attempt,
+        so a hit doesn't depend on the length heuristics; refresh_cache
+        regenerates it.
         """
-        response = self._call_llm(provider, model, system_prompt, user_prompt)
+        key = cache_key("linkedin", provider, model, system_prompt, user_prompt)
+        if not refresh_cache:
+            cached = get_cached_response(key)
+            if cached is not None:
+                return cached
+        message = self._generate_message(provider, model, system_prompt, user_prompt, max_attempts)
+        # The truncation fallback is over the limit; leave it uncached so a
+        # later run tries again
+        if len(message) <= 300:
+            set_cached_response(key, message)
+        return message
+
+    def _generate_message(self, provider, model, system_prompt, user_prompt, max_attempts):
+        if self._predicted_length(user_prompt) > 320:
+            # Appended, so the shared system prompt prefix stays cacheable
+            system_prompt = system_prompt + self._LENGTH_DIRECTIVE
+        response = self._call_llm(provider, model, system_prompt, user_prompt, max_tokens=MESSAGE_MAX_TOKENS, use_cache=False)
+        self._record_expansion(user_prompt, response)
         original_response = response
 
         for attempt in range(max_attempts):
             if len(response) <= 300:
                 return response
 
+            # Only slightly too long: try tightening the wording locally first
+            if len(response) <= 330:
+                trimmed = self._local_trim(response)
+                if len(trimmed) <= 300:
+                    return trimmed
+
             # Build a 'shortening prompt'
             error_msg = [f"Current length: {len(response)} characters"]
             shorten_prompt = (
@@ -122,13 +192,40 @@ class LinkedInMessageTransformation(MultiLLMTransformation):
             )
 
             # Re-run with the shorten prompt as user prompt
-            response = self._call_llm(provider, model, system_prompt, shorten_prompt)
+            response = self._call_llm(provider, model, system_prompt, shorten_prompt, max_tokens=SHORTEN_MAX_TOKENS, use_cache=False)
 
         # Final fallback if still too long
         if len(response) > 300:
             return self._truncate_fallback(original_response)
         return response
 
+    def _predicted_length(self, user_prompt):
+        if self._expansion_ratio is None:
+            return 0
+        return len(user_prompt) * self._expansion_ratio
+
+    def _record_expansion(self, user_prompt, response):
+        if not user_prompt:
+            return
+        ratio = len(response) / len(user_prompt)
+        # Worker threads may race here; losing an update only nudges a heuristic
+        if self._expansion_ratio is None:
+            self._expansion_ratio = ratio
+        else:
+            self._expansion_ratio = 0.9 * self._expansion_ratio + 0.1 * ratio
+
+    def _local_trim(self, text, target=300):
+        """
+        Shorten `text` without changing what it says: collapse whitespace,
+        normalise smart quotes and use contractions. Stops as soon as it fits.
+        """
+        text = text.strip()
+        for pattern, replacement in _TRIM_REPLACEMENTS:
+            if len(text) <= target:
+                break
+            text = pattern.sub(replacement, text)
+        return text
+
     def _truncate_fallback(self, text):
         truncated = text[:297].rstrip()
         if not truncated.endswith((".", "!", "?")):
@@ -148,15 +245,16 @@ class LinkedInMessageTransformation(MultiLLMTransformation):
         """
         widget = QWidget(parent)
         layout = QVBoxLayout(widget)
+        data = self.load_custom_settings()
 
         layout.addWidget(QLabel("LinkedIn Message Template:"))
         self.template_edit = QPlainTextEdit()
-        self.template_edit.setPlainText(self.load_custom_settings().get("template", ""))
+        self.template_edit.setPlainText(data.get("template", ""))
         layout.addWidget(self.template_edit)
 
         layout.addWidget(QLabel("Few-Shot Examples (optional):"))
         self.examples_edit = QPlainTextEdit()
-        self.examples_edit.setPlainText(self.load_custom_settings().get("examples", ""))
+        self.examples_edit.setPlainText(data.get("examples", ""))
         layout.addWidget(self.examples_edit)
 
         return widget
@@ -165,18 +263,12 @@ class LinkedInMessageTransformation(MultiLLMTransformation):
         """
         Read from text files. Return a dict
         with 'template' and 'examples' for pre-filling the UI.
+        Reads are cached until the files change on disk.
         """
-        data = {"template": "", "examples": ""}
-
-        if os.path.exists(self._template_file):
-            with open(self._template_file, "r", encoding="utf-8") as f:
-                data["template"] = f.read()
-
-        if os.path.exists(self._examples_file):
-            with open(self._examples_file, "r", encoding="utf-8") as f:
-                data["examples"] = f.read()
-
-        return data
+        return {
+            "template": _read_optional_text(self._template_file) or "",
+            "examples": _read_optional_text(self._examples_file) or "",
+        }
 
     def save_custom_settings(self, widget_data: dict):
         """
@@ -1,10 +1,13 @@
 # transformations/llm_transformation.py
 import os
+import threading
 import time
 import requests
 import openai
 import anthropic
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
 load_dotenv()
 import logging
@@ -12,11 +15,31 @@ logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
 from transformations.base import BaseTransformation, SafeTemplate
+from services.llm_cache_service import cache_key, get_cached_response, set_cached_response
+
+TRANSFORMATION_NAMES = ("Multi-Provider LLM Transformation",)
+
+DEFAULT_MAX_WORKERS = 8
+
+OLLAMA_URL = "http://localhost:11434"
+# Keep the model loaded between rows and runs instead of Ollama's 5 minute default
+OLLAMA_KEEP_ALIVE = "30m"
+
+def _unparsed(response):
+    return response
 
 class MultiLLMTransformation(BaseTransformation):
     name = "Multi-Provider LLM Transformation"
     description = "Calls OpenAI, Anthropic, or Ollama with templated prompts."
 
+    # Shared by every LLM transformation (and subclass) instance, so the app
+    # holds one connection pool per provider/key rather than one per instance
+    _client_cache = {}
+    _ollama_session = None
+    _client_lock = threading.Lock()
+
+    uses_response_cache = True
+
     def required_inputs(self):
         return []  # No direct column inputs
 
@@ -50,6 +73,16 @@ class MultiLLMTransformation(BaseTransformation):
                 "name": "api_key",
                 "type": "text",
                 "description": "API key (leave blank for environment variable)"
+            },
+            {
+                "name": "max_workers",
+                "type": "text",
+                "description": f"Parallel LLM requests (default {DEFAULT_MAX_WORKERS})"
+            },
+            {
+                "name": "max_tokens",
+                "type": "text",
+                "description": "Maximum tokens per response (leave blank for the provider default)"
             }
         ]
 
@@ -68,38 +101,122 @@ class MultiLLMTransformation(BaseTransformation):
         model_name = kwargs.get("model", "gpt-4o-mini").strip()
         if extra_placeholders is None:
             extra_placeholders = {}
+        try:
+            max_tokens = int(kwargs.get("max_tokens") or 0) or None
+        except ValueError:
+            max_tokens = None
+        # Set by the manager for explicit run-row clicks, to regenerate
+        refresh_cache = kwargs.get("refresh_cache", False)
         # Initialize clients
-        
+        self._init_clients()
         placeholder_wrapper = self.get_placeholder_wrapper(extra_placeholders)
-        # Process prompts for each row
-        for idx, row in df.iterrows():
+
+        # Fill the prompts for each row; only the LLM calls run on the pool
+        jobs = [
+            (placeholder_wrapper(system_prompt, row), placeholder_wrapper(user_prompt, row))
+            for row in df.to_dict("records")
+        ]
+
+        def process(job):
+            final_system, final_user = job
             try:
-                final_system = placeholder_wrapper(system_prompt, row)
-                final_user = placeholder_wrapper(user_prompt, row)
-                response = self._call_llm(provider, model_name, final_system, final_user, json_mode)
-                df.at[idx, output_col_name] = response
+                return self._call_llm(provider, model_name, final_system, final_user, json_mode, max_tokens=max_tokens,
+                                      refresh_cache=refresh_cache)
             except Exception as e:
-                df.at[idx, output_col_name] = f"ERROR: {e}"
+                return f"ERROR: {e}"
+
+        # Results come back in row order, so the column is written once
+        df[output_col_name] = self._map_concurrently(process, jobs, kwargs.get("max_workers"))
 
         return df
 
+    def _map_concurrently(self, fn, items, max_workers=None):
+        """
+        Map `fn` over `items` on a thread pool and return the results in order.
+        LLM calls are network-bound, so threads overlap their latency; the
+        SDK clients are httpx-based and safe to share between threads.
+        Applying a transformation hands over all its pending rows at once;
+        run-row hands over one, which skips the pool.
+        """
+        try:
+            max_workers = max(1, int(max_workers or DEFAULT_MAX_WORKERS))
+        except ValueError:
+            max_workers = DEFAULT_MAX_WORKERS
+        if len(items) <= 1:
+            return [fn(item) for item in items]
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as pool:
+            return list(pool.map(fn, items))
+
     def _init_clients(self):
-        self.openai_client = openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY", ""))
-        self.anthropic_client = anthropic.Anthropic(
-            api_key=os.getenv("ANTHROPIC_API_KEY", "")
-        )
+        self.openai_client = self._get_client("openai", os.getenv("OPENAI_API_KEY", ""))
+        self.anthropic_client = self._get_client("anthropic", os.getenv("ANTHROPIC_API_KEY", ""))
+        with MultiLLMTransformation._client_lock:
+            if MultiLLMTransformation._ollama_session is None:
+                MultiLLMTransformation._ollama_session = self._new_ollama_session()
+        self._clients_ready = True
+
+    def _new_ollama_session(self):
+        """
+        One keep-alive session for all Ollama calls, with a pool big enough
+        for the worker threads, instead of a new connection per row.
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=DEFAULT_MAX_WORKERS * 2)
+        session.mount(OLLAMA_URL, adapter)
+        return session
+
+    def _get_client(self, provider, api_key):
+        """
+        SDK clients are cached per (provider, api_key): each one owns an HTTP
+        connection pool, so rebuilding it on every call throws that away.
+        """
+        with MultiLLMTransformation._client_lock:
+            cache = MultiLLMTransformation._client_cache
+            client = cache.get((provider, api_key))
+            if client is None:
+                client_cls = openai.OpenAI if provider == "openai" else anthropic.Anthropic
+                client = cache[(provider, api_key)] = client_cls(api_key=api_key)
+            return client
 
-    def _call_llm(self, provider, model_name, system_prompt, user_prompt, json_mode=False, max_retries=3):
+    def _call_llm(self, provider, model_name, system_prompt, user_prompt, json_mode=False, max_retries=3, max_tokens=None,
+                  use_cache=True, refresh_cache=False, parse=None):
+        """
+        Identical requests (e.g. re-running a sheet) are answered from the
+        response cache; only successful responses are stored.
+        parse, if given, turns the response into the returned value and
+        raises on output the caller can't use; such responses are never
+        cached, so the next run asks the model again.
+        refresh_cache skips the lookup but stores the new response (explicit
+        re-runs); use_cache=False bypasses the cache entirely, for callers
+        that cache their own final result.
+        """
+        if parse is None:
+            parse = _unparsed
+        if not use_cache:
+            return parse(self._request_llm(provider, model_name, system_prompt, user_prompt, json_mode, max_retries, max_tokens))
+        key = cache_key(provider, model_name, system_prompt, user_prompt, json_mode, max_tokens)
+        if not refresh_cache:
+            cached = get_cached_response(key)
+            if cached is not None:
+                return parse(cached)
+        response = self._request_llm(provider, model_name, system_prompt, user_prompt, json_mode, max_retries, max_tokens)
+        result = parse(response)
+        set_cached_response(key, response)
+        return result
+
+    def _request_llm(self, provider, model_name, system_prompt, user_prompt, json_mode=False, max_retries=3, max_tokens=None):
         delay = 2
-        self._init_clients()
+        # transform() sets the clients up once; this only covers direct callers
+        if not getattr(self, "_clients_ready", False):
+            self._init_clients()
         for attempt in range(max_retries):
             try:
                 if provider == "openai":
-                    return self._call_openai(model_name, system_prompt, user_prompt, json_mode)
+                    return self._call_openai(model_name, system_prompt, user_prompt, json_mode, max_tokens)
                 elif provider == "anthropic":
-                    return self._call_anthropic(model_name, system_prompt, user_prompt)
+                    return self._call_anthropic(model_name, system_prompt, user_prompt, max_tokens)
                 elif provider == "ollama":
-                    return self._call_ollama(model_name, system_prompt, user_prompt)
+                    return self._call_ollama(model_name, system_prompt, user_prompt, max_tokens)
                 else:
                     raise ValueError(f"Unknown provider: {provider}")
             except Exception as e:
@@ -109,7 +226,7 @@ class MultiLLMTransformation(BaseTransformation):
                 else:
                     raise e
 
-    def _call_openai(self, model_name, system_prompt, user_prompt, json_mode=False):
+    def _call_openai(self, model_name, system_prompt, user_prompt, json_mode=False, max_tokens=None):
         messages = [
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": user_prompt}
@@ -118,30 +235,39 @@ class MultiLLMTransformation(BaseTransformation):
             model=model_name,
             messages=messages,
             temperature=0.7,
-            response_format={"type": "json_object"} if json_mode else None
+            response_format={"type": "json_object"} if json_mode else None,
+            max_tokens=max_tokens
         )
         return completion.choices[0].message.content.strip()
 
-    def _call_anthropic(self, model_name, system_prompt, user_prompt):
+    def _call_anthropic(self, model_name, system_prompt, user_prompt, max_tokens=None):
+        # The system prompt is the same for every row of a transform, so mark
+        # it cacheable; OpenAI/DeepSeek cache shared prefixes on their own.
+        # Empty text blocks are rejected, so a blank prompt is sent as-is.
+        if system_prompt:
+            system_prompt = [{"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}}]
         message = self.anthropic_client.messages.create(
             model=model_name,
             system=system_prompt,
-            max_tokens=4000,
+            max_tokens=max_tokens or 4000,
             messages=[{"role": "user", "content": user_prompt}],
             temperature=0.7,
         )
         return message.content[0].text.strip()
 
-    def _call_ollama(self, model_name, system_prompt, user_prompt):
-        url = "http://localhost:11434/api/generate"
+    def _call_ollama(self, model_name, system_prompt, user_prompt, max_tokens=None):
+        url = f"{OLLAMA_URL}/api/generate"
         payload = {
             "model": model_name,
             "prompt": system_prompt + "\n\n" + user_prompt,
             "stream": False,
-            "temperature": 0.7
+            "temperature": 0.7,
+            "keep_alive": OLLAMA_KEEP_ALIVE
         }
+        if max_tokens:
+            payload["options"] = {"num_predict": max_tokens}
         logger.debug(payload)
-        resp = requests.post(url, json=payload, timeout=120)
+        resp = self._ollama_session.post(url, json=payload, timeout=120)
         if resp.status_code != 200:
             raise ValueError(f"Ollama error: {resp.status_code} - {resp.text}")
         return resp.json().get("response", "").strip()
\ No newline at end of file
@@ -1,7 +1,11 @@
 import os
-import time
 import json
+import hashlib
 import subprocess
+import tempfile
+import numpy as np
+import threading
+from collections import OrderedDict
 import pandas as pd
 from fpdf import FPDF
 from pydantic import BaseModel, ValidationError
@@ -21,9 +25,24 @@ try:
 except ImportError:
     from langchain.vectorstores import FAISS
 from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib json module
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
+def _json_bytes(obj, sort_keys=False):
+    """UTF-8 JSON for `obj`, via orjson when it's installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS if sort_keys else 0)
+    return json.dumps(obj, ensure_ascii=False, sort_keys=sort_keys).encode("utf-8")
+
+def _json_loads(text):
+    return orjson.loads(text) if orjson is not None else json.loads(text)
+
 # Allowed resume section types
 ALLOWED_TYPES = [
     'summary', 'profile', 'work', 'volunteer', 'education', 'awards',
@@ -31,6 +50,67 @@ ALLOWED_TYPES = [
     'references', 'projects'
 ]
 
+QUERY_EMBEDDING_CACHE_SIZE = 1024
+
+# Resume-section embeddings are saved here between runs, keyed by a hash of
+# the embedding model and the exact section texts
+EMBEDDING_CACHE_DIR = ".embedding_cache"
+
+def _section_vectors_path(model, texts):
+    digest = hashlib.sha256(_json_bytes([model, texts])).hexdigest()
+    return os.path.join(EMBEDDING_CACHE_DIR, f"{digest}.npy")
+
+def _load_section_vectors(path, count):
+    """Saved vectors for the sections, or None if missing or unreadable."""
+    try:
+        vectors = np.load(path)
+    except (OSError, ValueError):
+        return None
+    return vectors if len(vectors) == count else None
+
+def _save_section_vectors(path, vectors):
+    os.makedirs(EMBEDDING_CACHE_DIR, exist_ok=True)
+    # Write to a temp file and rename, so a concurrent reader never sees half a file
+    fd, temp_path = tempfile.mkstemp(suffix=".npy", dir=EMBEDDING_CACHE_DIR)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.save(f, vectors)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+
+class CachedQueryEmbeddings(Embeddings):
+    """
+    Wraps an Embeddings model with an LRU cache for embed_query, so the same
+    job summary isn't sent to the embeddings API twice in a session.
+    Document embeddings pass straight through.
+    """
+    def __init__(self, embeddings, maxsize=QUERY_EMBEDDING_CACHE_SIZE):
+        self._embeddings = embeddings
+        self.model = getattr(embeddings, "model", "")
+        self._maxsize = maxsize
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def embed_documents(self, texts):
+        return self._embeddings.embed_documents(texts)
+
+    def embed_query(self, text):
+        key = hashlib.sha256(text.encode("utf-8")).digest()
+        with self._lock:
+            vector = self._cache.get(key)
+            if vector is not None:
+                self._cache.move_to_end(key)
+                return vector
+        vector = self._embeddings.embed_query(text)
+        with self._lock:
+            self._cache[key] = vector
+            while len(self._cache) > self._maxsize:
+                self._cache.popitem(last=False)
+        return vector
+
 # Pydantic model for resume section
 class ResumeSection(BaseModel):
     section: str
@@ -59,9 +139,9 @@ def resume_to_objects(resume: dict) -> list:
                     startDate = item.get('startDate', '')
                     endDate = item.get('endDate', '')
                     summary = item.get('summary', '')
-                    text = f"{position} at {name} ({startDate} - {endDate}) - {summary}"
-                    for highlight in item.get('highlights', []):
-                        text += f"\nHighlight: {highlight}"
+                    lines = [f"{position} at {name} ({startDate} - {endDate}) - {summary}"]
+                    lines += [f"Highlight: {highlight}" for highlight in item.get('highlights', [])]
+                    text = "\n".join(lines)
                 elif section == 'education':
                     studyType = item.get('studyType', '')
                     area = item.get('area', '')
@@ -69,9 +149,9 @@ def resume_to_objects(resume: dict) -> list:
                     startDate = item.get('startDate', '')
                     endDate = item.get('endDate', '')
                     score = item.get('score', '')
-                    text = f"{studyType} in {area} from {institution} ({startDate} - {endDate}) - Score: {score}"
-                    for course in item.get('courses', []):
-                        text += f"\nCourse: {course}"
+                    lines = [f"{studyType} in {area} from {institution} ({startDate} - {endDate}) - Score: {score}"]
+                    lines += [f"Course: {course}" for course in item.get('courses', [])]
+                    text = "\n".join(lines)
                 elif section in ['awards', 'certificates', 'publications']:
                     name = item.get('name', '')
                     date = item.get('date', '')
@@ -133,10 +213,16 @@ class ResumeModel(BaseModel):
     references: list = []
     projects: list = []
 
+TRANSFORMATION_NAMES = ("Make Resume Transformation",)
+
 class MakeResumeTransformation(MultiLLMTransformation):
     name = "Make Resume Transformation"
     description = "Generates a comprehensive resume PDF tailored for a job application by combining personal resume data with job description analysis."
     predefined_output = True
+
+    # Set once the Node.js/resume-cli check has passed in this process
+    _node_verified = False
+
     def required_inputs(self):
         # Require the Job_Description column.
         return ["Job_Description"]
@@ -178,45 +264,38 @@ class MakeResumeTransformation(MultiLLMTransformation):
         model_name = kwargs.get("model", "gpt-4o-mini").strip()
         pdf_output_dir = kwargs.get("pdf_output_dir", os.getcwd())
         open_file_command = kwargs.get("open_file_command", "open {file}")
+        refresh_cache = kwargs.get("refresh_cache", False)
+        try:
+            max_tokens = int(kwargs.get("max_tokens") or 0) or None
+        except ValueError:
+            max_tokens = None
         
         os.makedirs(pdf_output_dir, exist_ok=True)
         
-        for idx, row in df.iterrows():
+        # The resume doesn't depend on the row: load, validate and embed it
+        # once per transform (the vector store is also reused across calls)
+        setup_error = None
+        try:
+            resume_json = self._load_resume_json(provider, model_name, refresh_cache)
+            vectorstores = self._get_vectorstores(resume_json)
+        except Exception as e:
+            setup_error = str(e)
+        
+        # Only the two columns the loop reads; rows without a job description
+        # keep their current output, and the column is written once at the end
+        n_rows = len(df)
+        job_descs = df["Job_Description"].tolist() if "Job_Description" in df.columns else [""] * n_rows
+        companies = df["Company"].tolist() if "Company" in df.columns else ["Company"] * n_rows  # Assuming Company column exists
+        outputs = df[output_col_name].tolist() if output_col_name in df.columns else [None] * n_rows
+        
+        def process_row(item):
+            i, job_desc, company_name = item
             try:
-                job_desc = str(row.get("Job_Description", "")).strip()
-                if not job_desc:
-                    continue
-                
                 # Step 1: Summarize job description
-                summarized_job = self._summarize_job_description(job_desc, provider, model_name)
-                
-                # Step 2: Get resume JSON (will convert from text if needed)
-                from services.settings_service import get_resume_json
-                resume_json = get_resume_json()
-                if not resume_json:
-                    raise ValueError("Could not load or generate resume JSON")
-                
-                # Validate resume JSON using Pydantic.
-                try:
-                    ResumeModel.model_validate(resume_json)
-                except ValidationError as ve:
-                    # If invalid, attempt conversion from resume text.
-                    resume_text = self._load_user_resume()
-                    resume_json_str = self._convert_resume_text_to_json(resume_text, provider, model_name)
-                    try:
-                        validated_resume = ResumeModel.model_validate_json(resume_json_str)
-                        resume_json = validated_resume.model_dump()
-                    except ValidationError as ve2:
-                        raise ValueError(f"Resume JSON validation error after conversion: {ve2}")
-                
-                # Step 3: Verify and adjust resume JSON.
-                resume_json = verify_resume_json(resume_json)
-                
-                # Step 4: Embed resume sections into a vector store.
-                vectorstore = self._embed_resume(resume_json)
+                summarized_job = self._summarize_job_description(job_desc, provider, model_name, max_tokens, refresh_cache)
                 
                 # Step 5: Retrieve top 5 matching sections per allowed type based on job description.
-                targeted_sections = self._get_target_resume_sections(vectorstore, summarized_job)
+                targeted_sections = self._get_target_resume_sections(vectorstores, summarized_job)
                 
                 # Step 6: Build final resume text from targeted sections.
                 final_resume_text = self._build_final_resume_text(targeted_sections)
@@ -225,40 +304,93 @@ class MakeResumeTransformation(MultiLLMTransformation):
                 first_name = resume_json['basics'].get('firstName', '')
                 last_name = resume_json['basics'].get('lastName', '')
                 job_position = resume_json['basics'].get('label', 'Resume')
-                company_name = row.get("Company", "Company")  # Assuming Company column exists
                 
                 # Create sanitized filename
                 file_base = f"{first_name}_{last_name}_resume_for_{job_position}_at_{company_name}".replace(" ", "_")
                 pdf_filename = f"{file_base}.pdf"
                 pdf_path = os.path.join(pdf_output_dir, pdf_filename)
                 
-                # Save temporary JSON file
-                temp_json = os.path.join(pdf_output_dir, f"temp_{int(time.time())}.json")
-                with open(temp_json, 'w') as f:
-                    json.dump(resume_json, f)
+                # Save temporary JSON file under a unique name, so concurrent rows can't collide
+                with tempfile.NamedTemporaryFile('wb', suffix='.json', prefix='temp_', delete=False,
+                                                 dir=pdf_output_dir) as f:
+                    f.write(_json_bytes(resume_json))
+                    temp_json = f.name
                 
-                # Generate PDF using resume-cli
-                subprocess.run(
-                    [
-                        'resume', 'export', pdf_path,
-                        '--resume', temp_json,
-                        '--theme', 'even',
-                        '--format', 'pdf'
-                    ],
-                    check=True
-                )
-                
-                # Clean up temporary JSON
-                os.remove(temp_json)
+                try:
+                    # Generate PDF using resume-cli
+                    subprocess.run(
+                        [
+                            'resume', 'export', pdf_path,
+                            '--resume', temp_json,
+                            '--theme', 'even',
+                            '--format', 'pdf'
+                        ],
+                        check=True
+                    )
+                finally:
+                    # Clean up temporary JSON, even if the export failed
+                    os.remove(temp_json)
                 
-                df.at[idx, output_col_name] = pdf_path
+                return i, pdf_path
                 
             except Exception as e:
-                df.at[idx, output_col_name] = f"ERROR: {str(e)}"
+                return i, f"ERROR: {str(e)}"
+        
+        items = []
+        for i, (job_desc, company_name) in enumerate(zip(job_descs, companies)):
+            job_desc = str(job_desc).strip()
+            if not job_desc:
+                continue
+            if setup_error is not None:
+                outputs[i] = f"ERROR: {setup_error}"
+                continue
+            items.append((i, job_desc, company_name))
+        
+        # Rows are independent and spend their time in the LLM, the embeddings
+        # API and resume-cli, so they run on the shared thread pool
+        for i, output in self._map_concurrently(process_row, items, kwargs.get("max_workers")):
+            outputs[i] = output
+        
+        df[output_col_name] = outputs
         return df
 
+    def _load_resume_json(self, provider, model_name, refresh_cache=False):
+        # Step 2: Get resume JSON (will convert from text if needed)
+        from services.settings_service import get_resume_json
+        resume_json = get_resume_json()
+        if not resume_json:
+            raise ValueError("Could not load or generate resume JSON")
+        
+        # Validate resume JSON using Pydantic.
+        try:
+            ResumeModel.model_validate(resume_json)
+        except ValidationError as ve:
+            # If invalid, attempt conversion from resume text.
+            resume_text = self._load_user_resume()
+            resume_json = self._convert_resume_text_to_json(resume_text, provider, model_name, refresh_cache)
+        
+        # Step 3: Verify and adjust resume JSON.
+        return verify_resume_json(resume_json)
+
+    def _get_vectorstores(self, resume_json):
+        """
+        Step 4: Embed resume sections into per-type vector stores. The stores
+        are kept for as long as the resume is unchanged, since the manager
+        runs this transformation one row at a time.
+        """
+        key = hashlib.sha256(_json_bytes(resume_json, sort_keys=True)).hexdigest()
+        cached = getattr(self, "_vectorstore_cache", None)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        vectorstores = self._embed_resume(resume_json)
+        self._vectorstore_cache = (key, vectorstores)
+        return vectorstores
+
     def _verify_node_environment(self):
         """Verify Node.js and required packages are installed"""
+        # The manager runs this per row; the npm checks only need to pass once
+        if type(self)._node_verified:
+            return
         logger.debug("Verifying Node.js environment")
         
         try:
@@ -301,6 +433,7 @@ class MakeResumeTransformation(MultiLLMTransformation):
                     shell=True if os.name == 'nt' else False
                 )
             
+            type(self)._node_verified = True
         except subprocess.CalledProcessError as e:
             error_msg = (
                 "Failed to verify Node.js environment:\n"
@@ -310,7 +443,7 @@ class MakeResumeTransformation(MultiLLMTransformation):
             logger.error(error_msg)
             raise RuntimeError(error_msg)
 
-    def _summarize_job_description(self, job_description, provider, model_name):
+    def _summarize_job_description(self, job_description, provider, model_name, max_tokens=None, refresh_cache=False):
         logger.debug(f"Summarizing job description using {provider} {model_name}")
         prompt_template = (
             "Summarize this job description focusing on responsibilities, skills, and requirements. "
@@ -318,7 +451,8 @@ class MakeResumeTransformation(MultiLLMTransformation):
             "----JOB DESCRIPTION----\n{job_description}\n-----------------------\n"
             "RESPONSE:"
         )
-        summary = self._call_llm(provider, model_name, "", prompt_template.format(job_description=job_description))
+        summary = self._call_llm(provider, model_name, "", prompt_template.format(job_description=job_description),
+                                 max_tokens=max_tokens, refresh_cache=refresh_cache)
         logger.debug("Job description summary complete")
         return summary.strip()
 
@@ -330,7 +464,7 @@ class MakeResumeTransformation(MultiLLMTransformation):
         logger.debug("User resume loaded successfully" if os.path.exists("user_resume.txt") else "No user resume file found")
         return ""
 
-    def _convert_resume_text_to_json(self, resume_text, provider, model_name):
+    def _convert_resume_text_to_json(self, resume_text, provider, model_name, refresh_cache=False):
         logger.debug(f"Converting resume text to JSON using {provider} {model_name}")
         if not os.path.exists("resumeJSONSchema.json"):
             raise FileNotFoundError("resumeJSONSchema.json not found.")
@@ -349,14 +483,24 @@ class MakeResumeTransformation(MultiLLMTransformation):
             "RESPONSE:"
         )
         prompt = prompt_template.format(resume_text=resume_text, resume_format=resume_format)
-        resume_json_str = self._call_llm(provider, model_name, "", prompt)
-        # Validate the LLM output using Pydantic.
-        try:
-            ResumeModel.model_validate_json(resume_json_str)
-            logger.debug("Resume text conversion to JSON complete")
-            return resume_json_str.strip()
-        except ValidationError as ve:
-            raise ValueError("LLM output did not validate against the resume schema: " + str(ve))
+
+        def parse(resume_json_str):
+            # Parse once, then validate the LLM output using Pydantic; the
+            # validated dict is returned so the caller doesn't parse it again.
+            # Raising here also keeps a bad conversion out of the LLM cache.
+            try:
+                data = _json_loads(resume_json_str.strip())
+            except ValueError as e:
+                raise ValueError("LLM output was not valid JSON: " + str(e))
+            try:
+                validated_resume = ResumeModel.model_validate(data)
+            except ValidationError as ve:
+                raise ValueError("LLM output did not validate against the resume schema: " + str(ve))
+            return validated_resume.model_dump()
+
+        resume = self._call_llm(provider, model_name, "", prompt, refresh_cache=refresh_cache, parse=parse)
+        logger.debug("Resume text conversion to JSON complete")
+        return resume
 
     def _embed_resume(self, resume_json):
         logger.debug("Creating embeddings for resume sections")
@@ -364,36 +508,64 @@ class MakeResumeTransformation(MultiLLMTransformation):
         docs = []
         for obj in sections:
             docs.append(Document(page_content=obj.text, metadata={"type": obj.section, "details": obj.details}))
-        embeddings = OpenAIEmbeddings()
-        vectorstore = FAISS.from_documents(docs, embeddings)
+        embeddings = self._get_embeddings()
+        texts = [doc.page_content for doc in docs]
+        
+        # The sections rarely change between runs, so reuse the saved vectors
+        vectors_path = _section_vectors_path(embeddings.model, texts)
+        vectors = _load_section_vectors(vectors_path, len(texts))
+        if vectors is None:
+            vectors = np.asarray(embeddings.embed_documents(texts), dtype=np.float32)
+            try:
+                _save_section_vectors(vectors_path, vectors)
+            except OSError as e:
+                logger.warning(f"Could not save resume embeddings: {e}")
+        
+        # One small store per section type, so retrieval asks each for its
+        # top 5 directly instead of ranking everything and filtering
+        by_type = {}
+        for doc, vector in zip(docs, vectors.tolist()):
+            by_type.setdefault(doc.metadata["type"], []).append((doc, vector))
+        vectorstores = {
+            section_type: FAISS.from_embeddings(
+                [(doc.page_content, vector) for doc, vector in entries],
+                embeddings,
+                metadatas=[doc.metadata for doc, _ in entries],
+            )
+            for section_type, entries in by_type.items()
+        }
         logger.debug(f"Created embeddings for {len(docs)} resume sections")
-        return vectorstore
+        return vectorstores
+
+    def _get_embeddings(self):
+        # One model per transformation, so its query cache outlives each vector store
+        embeddings = getattr(self, "_embeddings", None)
+        if embeddings is None:
+            embeddings = self._embeddings = CachedQueryEmbeddings(OpenAIEmbeddings())
+        return embeddings
 
-    def _get_target_resume_sections(self, vectorstore, job_description):
+    def _get_target_resume_sections(self, vectorstores, job_description):
         logger.debug("Retrieving targeted resume sections based on job description")
-        retriever = vectorstore.as_retriever(search_kwargs={"k": 1000})
-        results = retriever.get_relevant_documents(job_description)
+        # Embed the query once and search every type's store with the vector
+        query_vector = self._get_embeddings().embed_query(job_description)
         targeted = {}
         for t in ALLOWED_TYPES:
-            targeted[t] = []
-            count = 0
-            for doc in results:
-                if doc.metadata.get("type") == t:
-                    targeted[t].append(doc.metadata.get("details"))
-                    count += 1
-                if count == 5:
-                    break
+            store = vectorstores.get(t)
+            if store is None:
+                targeted[t] = []
+                continue
+            results = store.similarity_search_by_vector(query_vector, k=5)
+            targeted[t] = [doc.metadata.get("details") for doc in results]
         logger.debug(f"Retrieved sections for {len(targeted)} categories")
         return targeted
 
     def _build_final_resume_text(self, targeted_sections):
         logger.debug("Building final resume text from targeted sections")
-        final_text = ""
+        blocks = []
         for section, items in targeted_sections.items():
             if items:
-                final_text += section.upper() + ":\n"
-                for item in items:
-                    final_text += "- " + json.dumps(item) + "\n"
-                final_text += "\n"
+                lines = [section.upper() + ":"]
+                lines += ["- " + _json_bytes(item).decode("utf-8") for item in items]
+                blocks.append("\n".join(lines))
         logger.debug("Final resume text assembly complete")
-        return final_text.strip()
\ No newline at end of file
+        return "\n\n".join(blocks).strip()
\ No newline at end of file
@@ -9,6 +9,9 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# No transformations live here; lets discovery skip importing this module
+TRANSFORMATION_NAMES = ()
+
 class TransformationSignals(QObject):
     """Signals for transformation progress and completion"""
     started = pyqtSignal(int)  # row_idx
@@ -18,9 +21,10 @@ class TransformationSignals(QObject):
 
 class TransformationWorker(QRunnable):
     """Worker for processing transformations on a single row"""
-    def __init__(self, row_idx, df, trans_manager, sorted_transforms):
+    def __init__(self, row_idx, df, trans_manager, sorted_transforms, refresh_cache=False):
         super().__init__()
         self.row_idx = row_idx
+        self.refresh_cache = refresh_cache
         self.df = df.copy()
         self.trans_manager = trans_manager
         self.sorted_transforms = sorted_transforms
@@ -35,7 +39,7 @@ class TransformationWorker(QRunnable):
                 print(f"Processing {transform_id} for row {self.row_idx}")
                 try:
                     self.df = self.trans_manager.apply_single_transformation(
-                        self.df, transform_id, self.row_idx
+                        self.df, transform_id, self.row_idx, refresh_cache=self.refresh_cache
                     )
                 except Exception as e:
                     print(f"Error in {transform_id}: {str(e)}")
@@ -130,6 +134,8 @@ class TransformationManager:
             else:
                 rows_to_process = [i for i, cond in enumerate(condition_series) if cond]
 
+            # Rows to (re-)run, with the input signature each one runs with
+            pending = {}
             for r_idx in rows_to_process:
                 input_cols = meta["input_cols"]
                 new_sig = self.compute_row_signature(df, r_idx, input_cols)
@@ -147,9 +153,15 @@ class TransformationManager:
                 if completed and (new_sig == old_sig):
                     continue  # do not re-run this transformation for this row
 
-                # 3) otherwise run
-                df = self.run_transformation_row(df, transform_id, r_idx)
-                # 4) update row_signatures with new signature and mark completed
+                pending[r_idx] = new_sig
+
+            if not pending:
+                continue
+            # 3) otherwise run, all rows in one transform() call so the LLM
+            #    transformations can spread them over their worker pool
+            df = self.run_transformation_rows(df, transform_id, list(pending))
+            # 4) update row_signatures with new signature and mark completed
+            for r_idx, new_sig in pending.items():
                 meta["row_signatures"][str(r_idx)] = {
                     "signature": new_sig,
                     "completed": True
@@ -157,7 +169,7 @@ class TransformationManager:
 
         return df
 
-    def apply_single_transformation(self, df, transform_id, row_idx):
+    def apply_single_transformation(self, df, transform_id, row_idx, refresh_cache=False):
         # Get or create row-specific lock
         self.dict_lock.lock()
         try:
@@ -186,7 +198,7 @@ class TransformationManager:
                 return df
             logger.debug(f"Row {row_idx} should be processed")
             # Actually do the transformation
-            df = self.run_transformation_row(df, transform_id, row_idx)
+            df = self.run_transformation_row(df, transform_id, row_idx, refresh_cache=refresh_cache)
 
             # Update row signature and mark completed
             meta["row_signatures"][str(row_idx)] = {
@@ -198,9 +210,12 @@ class TransformationManager:
             row_lock.unlock()
         return df
 
-    def add_row_to_queue(self, row_idx, df, sorted_transforms):
-        """Add a row to be processed by worker threads"""
-        worker = TransformationWorker(row_idx, df, self, sorted_transforms)
+    def add_row_to_queue(self, row_idx, df, sorted_transforms, refresh_cache=False):
+        """
+        Add a row to be processed by worker threads.
+        refresh_cache regenerates LLM output instead of reusing cached responses.
+        """
+        worker = TransformationWorker(row_idx, df, self, sorted_transforms, refresh_cache)
         self.queue.put(worker)
         self._start_workers()
         return worker
@@ -261,7 +276,7 @@ class TransformationManager:
 
         # Default to False for unknown condition types
         return pd.Series([False] * len(df), index=df.index)
-    def run_transformation_row(self, df: pd.DataFrame, transform_id: str, row_idx: int) -> pd.DataFrame:
+    def run_transformation_row(self, df: pd.DataFrame, transform_id: str, row_idx: int, refresh_cache: bool = False) -> pd.DataFrame:
         """
         Actually call 'transformation.transform' for a single row.
         Because the default 'transform' often expects the entire DataFrame,
@@ -269,10 +284,17 @@ class TransformationManager:
 
         The transformation itself should handle row-by-row logic if needed.
         """
+        return self.run_transformation_rows(df, transform_id, [row_idx], refresh_cache)
+
+    def run_transformation_rows(self, df: pd.DataFrame, transform_id: str, row_indices: list, refresh_cache: bool = False) -> pd.DataFrame:
+        """
+        Call 'transformation.transform' once on a frame of just `row_indices`
+        and write the results back into df.
+        """
         meta = self._metadata["transformations"].get(transform_id)
         if not meta:
             return df
-        logger.debug(f"Running transformation {transform_id} for row {row_idx}")
+        logger.debug(f"Running transformation {transform_id} for rows {row_indices}")
         transformation = self.transformations_dict.get(meta["transformation_name"])
         if not transformation:
             logger.debug(f"Transformation {transform_id} not found")
@@ -281,18 +303,20 @@ class TransformationManager:
         input_cols = meta["input_cols"]
         output_col = meta["output_col"]
         extra_params = meta.get("extra_params", {})
+        if refresh_cache and transformation.uses_response_cache:
+            extra_params = {**extra_params, "refresh_cache": True}
 
-        # MODIFIED SECTION - Create single-row dataframe
-        row_df = df.iloc[[row_idx]].copy()  # Note double brackets to keep DataFrame structure
-        logger.debug(f"Running transformation {transform_id} on row {row_idx}")
+        # MODIFIED SECTION - Create a dataframe of just these rows
+        rows_df = df.iloc[row_indices].copy()
+        logger.debug(f"Running transformation {transform_id} on rows {row_indices}")
         
-        # Call the transformation on single-row dataframe
-        transformed_row_df = transformation.transform(row_df, output_col, *input_cols, **extra_params)
+        # Call the transformation on the rows' dataframe
+        transformed_rows_df = transformation.transform(rows_df, output_col, *input_cols, **extra_params)
         
         # Update original dataframe with results
-        df.update(transformed_row_df)
+        df.update(transformed_rows_df)
         
-        logger.debug(f"Transformation {transform_id} applied to row {row_idx}")
+        logger.debug(f"Transformation {transform_id} applied to rows {row_indices}")
         return df
     
     def should_process_transform(self, df: pd.DataFrame, transform_id: str, row_idx: int) -> bool:
@@ -8,6 +8,8 @@ from transformations.base import BaseTransformation
 
 logger = logging.getLogger(__name__)
 
+TRANSFORMATION_NAMES = ("Reoon Email Verification Transformation",)
+
 class ReoonVerifierClient:
     def __init__(self):
         self.api_key = os.getenv("REOON_API_KEY", "")
@@ -8,6 +8,8 @@ from transformations.base import BaseTransformation
 import pandas as pd
 logger = logging.getLogger(__name__)
 
+TRANSFORMATION_NAMES = ("Stealth Browser Web Scraper",)
+
 class StealthBrowserScraper:
     def __init__(self):
         self.browser_args = {
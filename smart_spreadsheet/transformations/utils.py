@@ -1,25 +1,173 @@
+import ast
 import importlib
+import os
 import pkgutil
+import threading
+from types import MappingProxyType
 
 from .base import BaseTransformation
 
+# Discovery helpers only; this module defines no transformations
+TRANSFORMATION_NAMES = ()
+
+# Discovered transformations, keyed by (package_name, module mtimes)
+_TRANSFORMATIONS_CACHE: dict[tuple, MappingProxyType] = {}
+# Sorted transformation names, under the same keys as _TRANSFORMATIONS_CACHE
+_SORTED_NAMES_CACHE: dict[tuple, tuple] = {}
+_CACHE_LOCK = threading.Lock()
+
+MANIFEST_NAME = "TRANSFORMATION_NAMES"
+
+
+class _LazyTransform:
+    """
+    Stand-in for a transformation whose module has not been imported yet.
+    The real instance is created on first attribute access, so heavy
+    dependencies (LLM SDKs, playwright, langchain...) only load when used.
+    """
+
+    def __init__(self, module_name, name, reload=False):
+        self._module_name = module_name
+        self._reload = reload
+        self._lock = threading.Lock()
+        self._instance = None
+        self.name = name
+
+    @property
+    def _impl(self):
+        if self._instance is None:
+            with self._lock:
+                if self._instance is None:
+                    module = importlib.import_module(self._module_name)
+                    if self._reload:
+                        module = importlib.reload(module)
+                    for obj in _transformation_classes(module):
+                        if obj.name == self.name:
+                            self._instance = obj()
+                            break
+                    else:
+                        raise ImportError(
+                            f"{self._module_name} declares '{self.name}' in "
+                            f"{MANIFEST_NAME} but defines no such transformation"
+                        )
+        return self._instance
+
+    def __getattr__(self, attr):
+        # Only called for attributes not found on the proxy itself
+        if attr.startswith("__"):
+            raise AttributeError(attr)
+        return getattr(self._impl, attr)
+
+
+def _transformation_classes(module):
+    for obj in vars(module).values():
+        if (
+            isinstance(obj, type)
+            and issubclass(obj, BaseTransformation)
+            and obj is not BaseTransformation
+        ):
+            yield obj
+
+
+def _read_manifest(path):
+    """
+    Return the TRANSFORMATION_NAMES declared at the top of a module without
+    importing it, or None if the module does not declare one.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            tree = ast.parse(f.read(), filename=path)
+    except (OSError, SyntaxError):
+        return None
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(
+            isinstance(t, ast.Name) and t.id == MANIFEST_NAME for t in node.targets
+        ):
+            try:
+                return tuple(ast.literal_eval(node.value))
+            except ValueError:
+                return None
+    return None
+
+
+def _module_path(finder, module_name):
+    return os.path.join(finder.path, f"{module_name}.py")
+
+
+def _discovery_key(package_name, package):
+    """
+    Build a cache key from the package name and the mtime of every module in it,
+    so editing, adding or removing a transformation file invalidates the cache.
+    """
+    stamps = []
+    for finder, module_name, _ in pkgutil.iter_modules(package.__path__):
+        try:
+            stamps.append((module_name, os.stat(_module_path(finder, module_name)).st_mtime_ns))
+        except OSError:
+            stamps.append((module_name, 0))
+    return (package_name, tuple(sorted(stamps)))
+
+
 def find_transformations_in_package(package_name="transformations"):
     """
-    Dynamically discovers and imports all modules in the given package,
-    returning a dict of { transformation_name: instance_of_that_transformation }.
+    Discovers all transformations in the given package, returning a read-only
+    mapping of { transformation_name: instance_of_that_transformation }.
+
+    Modules that declare a top-level TRANSFORMATION_NAMES tuple are not imported
+    here; they are wrapped in a lazy proxy that imports them on first use. Other
+    modules are imported eagerly. Results are cached until one of the package's
+    modules changes on disk.
+    """
+    return _discover(package_name)[0]
+
+
+def transformation_names(package_name="transformations"):
     """
+    Return the sorted names of the package's transformations as a tuple,
+    cached alongside the discovery results.
+    """
+    return _discover(package_name)[1]
+
+
+def _discover(package_name):
     package = importlib.import_module(package_name)
-    transformations = {}
-    for _, module_name, is_pkg in pkgutil.iter_modules(package.__path__):
-        if not is_pkg:
+    key = _discovery_key(package_name, package)
+    with _CACHE_LOCK:
+        cached = _TRANSFORMATIONS_CACHE.get(key)
+        if cached is not None:
+            return cached, _SORTED_NAMES_CACHE[key]
+
+        # A previous entry means files changed since the last scan: reload the
+        # modules whose mtime moved so the new code is actually picked up
+        stale_keys = [k for k in _TRANSFORMATIONS_CACHE if k[0] == package_name]
+        previous = set()
+        for stale in stale_keys:
+            previous.update(stale[1])
+        changed = {name for name, mtime in key[1] if previous and (name, mtime) not in previous}
+
+        transformations = {}
+        for finder, module_name, is_pkg in pkgutil.iter_modules(package.__path__):
+            if is_pkg:
+                continue
             full_module_name = f"{package_name}.{module_name}"
+            reload = module_name in changed and module_name not in ("base", "utils")
+
+            names = _read_manifest(_module_path(finder, module_name))
+            if names is not None:
+                for name in names:
+                    transformations[name] = _LazyTransform(full_module_name, name, reload)
+                continue
+
             module = importlib.import_module(full_module_name)
-            for name, obj in vars(module).items():
-                if (
-                    isinstance(obj, type)
-                    and issubclass(obj, BaseTransformation)
-                    and obj is not BaseTransformation
-                ):
-                    instance = obj()
-                    transformations[instance.name] = instance
-    return transformations
\ No newline at end of file
+            if reload:
+                module = importlib.reload(module)
+            for obj in _transformation_classes(module):
+                instance = obj()
+                transformations.setdefault(instance.name, instance)
+
+        for stale in stale_keys:
+            del _TRANSFORMATIONS_CACHE[stale]
+            _SORTED_NAMES_CACHE.pop(stale, None)
+        _TRANSFORMATIONS_CACHE[key] = MappingProxyType(transformations)
+        _SORTED_NAMES_CACHE[key] = tuple(sorted(transformations))
+        return _TRANSFORMATIONS_CACHE[key], _SORTED_NAMES_CACHE[key]
@@ -9,6 +9,8 @@ from transformations.reoon_transformation import ReoonVerifierClient
 load_dotenv()
 logger = logging.getLogger(__name__)
 
+TRANSFORMATION_NAMES = ("Wiza Individual Reveal Transformation",)
+
 class WizaAPI:
     def __init__(self):
         self.api_key = os.getenv("WIZA_API_KEY", "")
@@ -90,10 +92,16 @@ class WizaIndividualRevealTransformation(BaseTransformation):
             if col not in df.columns:
                 df[col] = None
 
-        def perform_reveal(row):
-            linkedin_url = row[linkedin_col]
+        # One pass over the LinkedIn column instead of df.apply(axis=1), which
+        # rebuilds every row as a Series and the whole frame from them.
+        # Results go into plain lists and each output column is assigned once.
+        emails = df['Email'].tolist()
+        summaries = df['LinkedIn_Summary'].tolist()
+        names = df["Hiring_Manager_Name"].tolist() if "Hiring_Manager_Name" in df.columns else None
+
+        for i, linkedin_url in enumerate(df[linkedin_col].tolist()):
             if pd.isna(linkedin_url) or not linkedin_url.strip():
-                return row
+                continue
 
             try:
                 reveal_data = wiza_api.get_profile_data(linkedin_url)
@@ -101,21 +109,21 @@ class WizaIndividualRevealTransformation(BaseTransformation):
                 
                 # Extract and verify emails
                 personal_email, work_email = self._process_emails(data, reoon_client)
-                
-                # Build professional summary
-
 
                 # Update row with extracted data
-                row['Email'] = work_email if work_email else personal_email
-                row['LinkedIn_Summary'] = data
-                row["Hiring_Manager_Name"] = data.get("name", row["Hiring_Manager_Name"])
+                emails[i] = work_email if work_email else personal_email
+                summaries[i] = data
+                if names is not None:
+                    names[i] = data.get("name", names[i])
 
             except Exception as e:
                 logger.error(f"[Wiza] Error processing row: {e}")
 
-            return row
-
-        return df.apply(perform_reveal, axis=1)
+        df['Email'] = emails
+        df['LinkedIn_Summary'] = summaries
+        if names is not None:
+            df["Hiring_Manager_Name"] = names
+        return df
 
     def _process_emails(self, data, reoon_client):
         personal_email = None
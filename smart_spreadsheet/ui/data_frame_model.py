@@ -1,32 +1,157 @@
+import numpy as np
 import pandas as pd
 from PyQt6.QtCore import (
     Qt, QAbstractTableModel, QModelIndex, QVariant
 )
 
+try:
+    import pyarrow  # noqa: F401  (only needed for the Arrow-backed string dtype)
+    _STRING_DTYPE = "string[pyarrow]"
+    _HAS_ARROW = True
+except ImportError:
+    _STRING_DTYPE = "string"
+    _HAS_ARROW = False
+
+_BOOL_STRINGS = {"true": True, "false": False, "1": True, "0": False}
+
+def _convert_series(series: pd.Series, new_dtype: str) -> pd.Series:
+    """
+    Convert a column with pandas' vectorized parsers where one exists.
+    Cells that can't be converted become missing instead of failing the
+    whole column.
+    """
+    if new_dtype == "int":
+        numeric = pd.to_numeric(series, errors="coerce")
+        # Nullable Int64 rather than a downcast int8/int16, which the next
+        # larger edit would push to object; fractional values stay float
+        whole = numeric.dropna()
+        if (whole == whole.round()).all():
+            return numeric.astype("Int64")
+        return numeric
+    if new_dtype == "float":
+        return pd.to_numeric(series, errors="coerce", downcast="float")
+    if new_dtype == "datetime64[ns]":
+        return pd.to_datetime(series, errors="coerce", cache=True, format="mixed")
+    if new_dtype == "bool":
+        return series.astype(str).str.strip().str.lower().map(_BOOL_STRINGS).astype("boolean")
+    if new_dtype == "str":
+        return series.astype(_STRING_DTYPE)
+    return series.astype(new_dtype)
+
+def _converter_name(dtype) -> str:
+    """The _convert_series target that produces columns of `dtype`."""
+    if pd.api.types.is_bool_dtype(dtype):
+        return "bool"
+    if pd.api.types.is_integer_dtype(dtype):
+        return "int"
+    if pd.api.types.is_float_dtype(dtype):
+        return "float"
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return "datetime64[ns]"
+    return "str"
+
+def _nullable_dtype(dtype) -> str:
+    """The masked dtype matching a NumPy int/uint/bool dtype."""
+    if dtype.kind == "b":
+        return "boolean"
+    bits = dtype.itemsize * 8
+    return f"Int{bits}" if dtype.kind == "i" else f"UInt{bits}"
+
+def _blank_column(index: pd.Index):
+    """
+    An all-missing column for `index`, stored as Arrow strings when pyarrow
+    is available and as float NaN otherwise, never as Python-object None.
+    """
+    if _HAS_ARROW:
+        return pd.array([pd.NA] * len(index), dtype=_STRING_DTYPE)
+    return np.full(len(index), np.nan, dtype="float64")
+
 class DataFrameModel(QAbstractTableModel):
     """
     A custom Qt model that bridges a pandas DataFrame and a QTableView.
     Allows direct editing of cells.
+
+    Rows are exposed to views in chunks of FETCH_CHUNK through
+    canFetchMore/fetchMore, so opening a huge file doesn't make Qt lay out
+    every row up front.
     """
 
-    def __init__(self, df=pd.DataFrame(), parent=None):
+    FETCH_CHUNK = 10_000
+
+    def __init__(self, df=None, parent=None):
         super().__init__(parent)
-        self._df = df.copy()
+        # Stored by reference; with pandas copy-on-write enabled (see app.py)
+        # the caller's later writes never leak into the model.
+        self._df = df if df is not None else pd.DataFrame()
+        self._visible_rows = min(self.FETCH_CHUNK, len(self._df.index))
+        self._reset_display_cache()
 
     def setDataFrame(self, df: pd.DataFrame):
         """Replace the current DataFrame."""
         if '__Run_Row__' not in df.columns:
-            df.insert(0, '__Run_Row__', '')
+            df.insert(0, '__Run_Row__', pd.Series("", index=df.index, dtype=_STRING_DTYPE))
         self.beginResetModel()
-        self._df = df.copy()
+        if len(df.index) == len(self._df.index):
+            # Same rows with new values (e.g. a transformation result): keep
+            # what was fetched so the view doesn't jump back to the top
+            visible = max(self._visible_rows, self.FETCH_CHUNK)
+        else:
+            visible = self.FETCH_CHUNK
+        self._df = df
+        self._visible_rows = min(visible, len(df.index))
+        self._reset_display_cache()
         self.endResetModel()
 
     def dataFrame(self) -> pd.DataFrame:
-        """Return a copy of the current DataFrame."""
-        return self._df.copy()
+        """
+        Return a copy of the current DataFrame that is safe to mutate.
+        Under copy-on-write this is a lazy copy: data is only duplicated
+        for the columns the caller actually writes to.
+        """
+        return self._df.copy(deep=not pd.get_option("mode.copy_on_write"))
+
+    def dataFrameView(self) -> pd.DataFrame:
+        """Return the current DataFrame itself, for read-only access."""
+        return self._df
+
+    def _reset_display_cache(self):
+        """Drop every cached display column (shape or contents changed)."""
+        self._display_cache = [None] * len(self._df.columns)
+
+    def _display_column(self, col: int) -> np.ndarray:
+        """
+        Return column `col` as an array of display strings, building it once
+        so data() is a plain array lookup on every paint.
+        """
+        arr = self._display_cache[col]
+        if arr is None:
+            series = self._df.iloc[:, col]
+            # copy=True: under copy-on-write to_numpy can hand back a read-only view
+            arr = series.astype(str).to_numpy(dtype=object, copy=True)
+            arr[series.isna().to_numpy()] = ""
+            self._display_cache[col] = arr
+        return arr
 
     def rowCount(self, parent=QModelIndex()):
-        return len(self._df.index)
+        return self._visible_rows
+
+    def canFetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return False
+        return self._visible_rows < len(self._df.index)
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        self._expose_rows(min(self.FETCH_CHUNK, len(self._df.index) - self._visible_rows))
+
+    def _expose_rows(self, count: int):
+        """Tell views about `count` more already-present rows."""
+        if count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self._visible_rows, self._visible_rows + count - 1)
+        self._visible_rows += count
+        self.endInsertRows()
 
     def columnCount(self, parent=QModelIndex()):
         return len(self._df.columns)
@@ -35,13 +160,32 @@ class DataFrameModel(QAbstractTableModel):
         if not index.isValid():
             return QVariant()
         if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
-            value = self._df.iat[index.row(), index.column()]
-            return str(value) if pd.notnull(value) else ""
+            return self._display_column(index.column())[index.row()]
         return QVariant()
 
     def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
         if index.isValid() and role == Qt.ItemDataRole.EditRole:
-            self._df.iat[index.row(), index.column()] = value
+            row, col = index.row(), index.column()
+            try:
+                self._df.iat[row, col] = value
+            except (TypeError, ValueError):
+                # Masked/extension columns (e.g. "boolean" after a type change)
+                # reject raw strings; parse the edit the way the column was
+                # converted, and refuse it if even that doesn't fit
+                try:
+                    converter = _converter_name(self._df.dtypes.iloc[col])
+                    converted = _convert_series(pd.Series([value], dtype=object), converter).iloc[0]
+                    # The converters coerce unparseable input to missing;
+                    # only an empty edit may clear the cell
+                    if pd.isna(converted) and str(value).strip():
+                        return False
+                    self._df.iat[row, col] = converted
+                except (TypeError, ValueError, OverflowError):
+                    return False
+            cached = self._display_cache[col]
+            if cached is not None:
+                stored = self._df.iat[row, col]
+                cached[row] = str(stored) if pd.notnull(stored) else ""
             self.dataChanged.emit(index, index, [Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole])
             return True
         return False
@@ -66,63 +210,117 @@ class DataFrameModel(QAbstractTableModel):
         return QVariant()
 
     def insertRows(self, row, count=1, parent=QModelIndex()):
-        if row < 0 or row > self.rowCount():
+        if row < 0 or row > len(self._df.index):
             return False
 
+        # Rows can only be inserted into the part of the frame views know about
+        self._expose_rows(row - self._visible_rows)
+
         self.beginInsertRows(QModelIndex(), row, row + count - 1)
-        
-        new_rows = pd.DataFrame([{col: None for col in self._df.columns} for _ in range(count)])
-        
+
+        # Build the whole blank block at once and concat a single time
+        new_rows = self._blank_rows(count)
+
         if self._df.empty:
             self._df = new_rows
+        elif row == len(self._df.index):
+            self._df = pd.concat([self._df, new_rows], ignore_index=True, copy=False)
         else:
             top = self._df.iloc[:row]
             bottom = self._df.iloc[row:]
-            self._df = pd.concat([top, new_rows, bottom], ignore_index=True)
-        
+            self._df = pd.concat([top, new_rows, bottom], ignore_index=True, copy=False)
+        self._reset_display_cache()
+        self._visible_rows += count
+
         self.endInsertRows()
         return True
+
+    def _blank_rows(self, count: int) -> pd.DataFrame:
+        """
+        A block of `count` all-missing rows whose columns keep the frame's
+        dtypes wherever the dtype can hold a missing value, so inserting
+        rows doesn't promote typed columns to object.
+        """
+        arrays = {}
+        for i, dtype in enumerate(self._df.dtypes):
+            if isinstance(dtype, pd.api.extensions.ExtensionDtype):
+                arrays[i] = pd.array([dtype.na_value] * count, dtype=dtype)
+            elif dtype.kind in "mM":
+                arrays[i] = np.full(count, "NaT", dtype=dtype)
+            elif dtype.kind in "fcO":
+                arrays[i] = np.full(count, np.nan, dtype=dtype)
+            else:
+                # NumPy ints/bools have no missing value; use their nullable
+                # counterparts, which concat keeps, rather than float NaN
+                arrays[i] = pd.array([pd.NA] * count, dtype=_nullable_dtype(dtype))
+        new_rows = pd.DataFrame(arrays, index=pd.RangeIndex(count))
+        new_rows.columns = self._df.columns
+        return new_rows
+
     def removeRows(self, row: int, count: int, parent=QModelIndex()) -> bool:
         try:
-            self.beginRemoveRows(parent, row, row + count - 1)
+            # Only the fetched part of the range needs to be announced
+            visible_end = min(row + count, self._visible_rows)
+            if row < visible_end:
+                self.beginRemoveRows(parent, row, visible_end - 1)
             self._df = self._df.drop(
                 index=range(row, row + count)
             ).reset_index(drop=True)
-            self.endRemoveRows()
+            self._reset_display_cache()
+            if row < visible_end:
+                self._visible_rows -= visible_end - row
+                self.endRemoveRows()
             return True
         except Exception as e:
             print(f"Error removing rows: {e}")
             return False
     def removeColumn(self, col_idx: int):
-        self.beginResetModel()
+        self.beginRemoveColumns(QModelIndex(), col_idx, col_idx)
         col_name = self._df.columns[col_idx]
         self._df.drop(columns=[col_name], inplace=True)
-        self.endResetModel()
+        del self._display_cache[col_idx]
+        self.endRemoveColumns()
 
     def renameColumn(self, col_idx, new_name: str):
-        self.beginResetModel()
         old_name = self._df.columns[col_idx]
         self._df.rename(columns={old_name: new_name}, inplace=True)
-        self.endResetModel()
+        # Only the header text changed; cell data and layout stay as they are
+        self.headerDataChanged.emit(Qt.Orientation.Horizontal, col_idx, col_idx)
 
     def changeColumnDtype(self, col_idx, new_dtype: str):
-        self.beginResetModel()
         col_name = self._df.columns[col_idx]
-        try:
-            self._df[col_name] = self._df[col_name].astype(new_dtype)
-        except Exception as e:
-            self.endResetModel()
-            raise e
-        self.endResetModel()
+        self._df[col_name] = _convert_series(self._df[col_name], new_dtype)
+        self._display_cache[col_idx] = None
+        self._emit_column_changed(col_idx)
 
     def insertColumn(self, col_name: str):
-        self.beginResetModel()
-        self._df[col_name] = None
-        self.endResetModel()
+        if col_name in self._df.columns:
+            # Assigning to an existing name resets that column in place
+            col_idx = self._df.columns.get_loc(col_name)
+            self._df[col_name] = _blank_column(self._df.index)
+            self._display_cache[col_idx] = None
+            self._emit_column_changed(col_idx)
+            return
+        col_idx = len(self._df.columns)
+        self.beginInsertColumns(QModelIndex(), col_idx, col_idx)
+        self._df[col_name] = _blank_column(self._df.index)
+        self._display_cache.append(None)
+        self.endInsertColumns()
+
+    def _emit_column_changed(self, col_idx: int):
+        if self.rowCount() == 0:
+            return
+        self.dataChanged.emit(
+            self.index(0, col_idx),
+            self.index(self.rowCount() - 1, col_idx),
+            [Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole]
+        )
+
     def clear_columns(self, columns, row_idx):
         """Clear specific columns in a row"""
         self.beginResetModel()
         for col in columns:
             if col in self._df.columns:
                 self._df.at[row_idx, col] = None
+        self._reset_display_cache()
         self.endResetModel()
\ No newline at end of file
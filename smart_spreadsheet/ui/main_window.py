@@ -9,7 +9,7 @@ from PyQt6.QtWidgets import (
 )
 import re
 from PyQt6.QtGui import QAction, QColor
-from PyQt6.QtCore import Qt, QPoint, QModelIndex, QTimer
+from PyQt6.QtCore import Qt, QPoint, QModelIndex, QTimer, QThreadPool
 from ui.compose_email_dialog import ComposeEmailDialog
 from datetime import datetime
 # Services and UI imports
@@ -20,13 +20,17 @@ from ui.column_row_delegate import ColumnRoleDelegate
 from ui.run_row_delegate import RunRowDelegate
 from ui.compose_email_dialog import ComposeEmailDialog
 from ui.transform_dialog import TransformDialog
-from services.file_service import load_data, save_data
-from transformations.utils import find_transformations_in_package
+from services.file_service import save_data
+from services.file_worker import LoadFileWorker, SaveFileWorker
+from transformations.utils import find_transformations_in_package, transformation_names
 from transformations.manager import TransformationManager
 from ui.transformation_header import TransformationHeader
 from services.email_service import extract_email_address
 from typing import Dict, List, Optional, Union, Any
 
+# Quiet time after the last edit before an auto-save writes the file
+AUTO_SAVE_DELAY_MS = 1000
+
 
 class MainWindow(QMainWindow):
     def __init__(self):
@@ -43,6 +47,16 @@ class MainWindow(QMainWindow):
         # Transformation manager (set when a file is loaded)
         self.trans_manager = None
 
+        # File loads/saves run here; one thread keeps writes in order
+        self.io_pool = QThreadPool()
+        self.io_pool.setMaxThreadCount(1)
+
+        # Each edit restarts this timer, so a burst of edits is saved once
+        self._auto_save_timer = QTimer(self)
+        self._auto_save_timer.setSingleShot(True)
+        self._auto_save_timer.setInterval(AUTO_SAVE_DELAY_MS)
+        self._auto_save_timer.timeout.connect(self._start_save)
+
         # Discover transformations
         self.transformations_dict = find_transformations_in_package("transformations")
 
@@ -98,9 +112,9 @@ class MainWindow(QMainWindow):
         )
         self.table_view.setHorizontalHeader(self.header)
         self.table_view.setItemDelegate(ColumnRoleDelegate(get_column_role=self.get_column_role, parent=self.table_view))
-        if "Application_Status" in self.df_model.dataFrame().columns:
+        if "Application_Status" in self.df_model.dataFrameView().columns:
             self.table_view.setItemDelegateForColumn(
-                self.df_model.dataFrame().columns.get_loc("Application_Status"),
+                self.df_model.dataFrameView().columns.get_loc("Application_Status"),
                 ApplicationStatusDelegate(self.table_view)
             )
         self.splitter.addWidget(self.table_view)
@@ -136,7 +150,7 @@ class MainWindow(QMainWindow):
         if self.transformations_dict:
             transformation_layout = QHBoxLayout()
             self.transform_combo = QComboBox()
-            self.transform_combo.addItems(self.transformations_dict.keys())
+            self.transform_combo.addItems(transformation_names("transformations"))
             transformation_layout.addWidget(self.transform_combo)
 
             apply_transform_button = QPushButton("Apply Transformation")
@@ -179,11 +193,11 @@ class MainWindow(QMainWindow):
 
     def update_header_actions(self):
         """Set which columns show action buttons based on transformations"""
-        if not hasattr(self, "df_model") or not self.df_model.dataFrame().attrs.get("column_metadata"):
+        if not hasattr(self, "df_model") or not self.df_model.dataFrameView().attrs.get("column_metadata"):
             return
 
         action_cols = [
-            i for i, col in enumerate(self.df_model.dataFrame().attrs["column_metadata"])
+            i for i, col in enumerate(self.df_model.dataFrameView().attrs["column_metadata"])
             if col["transform"] is not None
         ]
         self.header.set_action_columns(action_cols)
@@ -315,8 +329,10 @@ class MainWindow(QMainWindow):
     def save_current_file(self):
         if not self.current_file_path:
             return
-        self.auto_save(force=True)
-        QMessageBox.information(self, "Saved", f"File saved to:\n{self.current_file_path}")
+        self.auto_save(
+            force=True,
+            on_finished=lambda path, _: QMessageBox.information(self, "Saved", f"File saved to:\n{path}")
+        )
 
     # ------------------------------------------------------
     # LOADING FILES
@@ -332,8 +348,25 @@ class MainWindow(QMainWindow):
             self.load_file(file_path)
 
     def load_file(self, file_path):
+        """Read the file on the I/O thread; the UI is updated in _on_file_loaded."""
+        self.load_button.setEnabled(False)
+        self.statusBar().showMessage(f"Loading {file_path}...")
+        worker = LoadFileWorker(file_path)
+        worker.signals.finished.connect(self._on_file_loaded)
+        worker.signals.error.connect(self._on_file_load_error)
+        self.io_pool.start(worker)
+
+    def _on_file_load_error(self, file_path, error_msg):
+        self.load_button.setEnabled(True)
+        self.statusBar().clearMessage()
+        QMessageBox.critical(self, "Error Loading File", error_msg)
+
+    def _on_file_loaded(self, file_path, df):
+        self.load_button.setEnabled(True)
+        self.statusBar().clearMessage()
         try:
-            df = load_data(file_path)
+            # Pending edits belong to the previous file
+            self._flush_auto_save()
             df.columns = [col.replace(' ', '_') for col in df.columns]
             self.df_model.setDataFrame(df)
             self.set_current_file_path(file_path)
@@ -369,22 +402,54 @@ class MainWindow(QMainWindow):
     # ------------------------------------------------------
     # AUTO-SAVE
     # ------------------------------------------------------
-    def auto_save(self, *args, force=False):
+    def auto_save(self, *args, force=False, on_finished=None):
         """
         Auto-save the current DataFrame if a file is open.
         Also persist transformations metadata.
+
+        Plain auto-saves (cell edits, finished rows) only restart a short
+        timer, so typing queues one save rather than one per keystroke.
+        Forced saves start right away and take any pending one with them.
         """
         if not self.current_file_path:
-            return
+            return None
+        if not force and on_finished is None:
+            self._auto_save_timer.start()
+            return None
+        self._auto_save_timer.stop()
+        return self._start_save(force, on_finished)
+
+    def _flush_auto_save(self):
+        """Start the save an auto-save is still waiting on, if any."""
+        if self._auto_save_timer.isActive():
+            self._auto_save_timer.stop()
+            self._start_save()
+
+    def _start_save(self, force=False, on_finished=None):
+        """
+        The data file is written on the I/O thread from a snapshot of the
+        frame. `on_finished` is connected before the worker starts, so a
+        fast save can't complete before anyone is listening.
+        """
+        if not self.current_file_path:
+            return None
         try:
-            df = self.df_model.dataFrame()
-            save_data(df, self.current_file_path)
+            worker = SaveFileWorker(self.df_model.dataFrame(), self.current_file_path)
+            if force:
+                worker.signals.error.connect(
+                    lambda _, error_msg: QMessageBox.critical(self, "Auto-Save Error", error_msg)
+                )
+            if on_finished is not None:
+                worker.signals.finished.connect(on_finished)
+            self.io_pool.start(worker)
             # Save metadata if we have a manager
             if self.trans_manager:
                 self.trans_manager.save_metadata()
+            return worker
         except Exception as e:
             if force:
                 QMessageBox.critical(self, "Auto-Save Error", str(e))
+            return None
 
     # ------------------------------------------------------
     # CLOSE EVENT => SAVE TIMESTAMPED CSV
@@ -397,13 +462,16 @@ class MainWindow(QMainWindow):
             if self.trans_manager:
                 self.trans_manager.save_metadata()
 
+        # Let queued saves finish before the process exits
+        self._flush_auto_save()
+        self.io_pool.waitForDone()
         super().closeEvent(event)
 
     # ------------------------------------------------------
     # ROW / COLUMN Operations
     # ------------------------------------------------------
     def add_new_row(self):
-        row_position = self.df_model.rowCount()
+        row_position = len(self.df_model.dataFrameView().index)
         self.df_model.insertRows(row_position, 1)
         # auto-save triggered via dataChanged signal
 
@@ -421,7 +489,7 @@ class MainWindow(QMainWindow):
 
         # Add transformation actions if applicable
         if self.trans_manager:
-            col_name = self.df_model.dataFrame().columns[col_index]
+            col_name = self.df_model.dataFrameView().columns[col_index]
             transforms = []
             for tid, tmeta in self.trans_manager.get_metadata()["transformations"].items():
                 if tmeta["output_col"] == col_name:
@@ -456,7 +524,7 @@ class MainWindow(QMainWindow):
 
         row_idx = index.row()
         col_idx = index.column()
-        df = self.df_model.dataFrame()
+        df = self.df_model.dataFrameView()
         col_name = df.columns[col_idx]
 
         # If user is right-clicking on a "subject" column,
@@ -493,7 +561,7 @@ class MainWindow(QMainWindow):
         elif action == delete_row_action and index.isValid():
             self.delete_row(index.row())
     def duplicate_row_for_new_job(self, row_idx):
-        df = self.df_model.dataFrame()
+        df = self.df_model.dataFrameView()
         if row_idx < 0 or row_idx >= len(df):
             return
 
@@ -514,7 +582,7 @@ class MainWindow(QMainWindow):
         if self.trans_manager:
             self.trans_manager.copy_row_signatures(old_idx=old_row_idx, new_idx=new_row_idx)
     def duplicate_row_for_new_hiring_manager(self, row_idx):
-        df = self.df_model.dataFrame()
+        df = self.df_model.dataFrameView()
         if row_idx < 0 or row_idx >= len(df):
             return
 
@@ -540,7 +608,7 @@ class MainWindow(QMainWindow):
             return
 
         self.current_edit_index = index
-        df = self.df_model.dataFrame()
+        df = self.df_model.dataFrameView()
         cell_value = str(df.iloc[index.row(), index.column()])
         col_name = df.columns[index.column()]
 
@@ -610,7 +678,7 @@ class MainWindow(QMainWindow):
                 break
     def delete_row(self, row_idx: int):
         """Delete a row from the DataFrame with confirmation"""
-        df = self.df_model.dataFrame()
+        df = self.df_model.dataFrameView()
         if row_idx < 0 or row_idx >= len(df):
             return
 
@@ -648,7 +716,7 @@ class MainWindow(QMainWindow):
                 QMessageBox.critical(self, "Error", f"Could not add column:\n{e}")
 
     def rename_column(self, col_index):
-        df = self.df_model.dataFrame()
+        df = self.df_model.dataFrameView()
         old_name = df.columns[col_index]
         new_name, ok = QInputDialog.getText(
             self, "Rename Column", f"Enter a new name for '{old_name}':"
@@ -658,7 +726,7 @@ class MainWindow(QMainWindow):
             self.df_model.renameColumn(col_index, internal_name)
 
     def delete_column(self, col_index):
-        df = self.df_model.dataFrame()
+        df = self.df_model.dataFrameView()
         col_name = df.columns[col_index]
         reply = QMessageBox.question(
             self,
@@ -823,7 +891,7 @@ class MainWindow(QMainWindow):
         if not self.trans_manager or column_index < 0:
             return None
 
-        df = self.df_model.dataFrame()
+        df = self.df_model.dataFrameView()
         col_name = df.columns[column_index]
         
         # Check both single and multi-output transformations
@@ -839,7 +907,7 @@ class MainWindow(QMainWindow):
         if row_idx in self.processing_rows:
             return
             
-        df = self.df_model.dataFrame()
+        df = self.df_model.dataFrameView()
         sorted_transforms = self.get_sorted_transformations()
         
         # Check conditions for each transformation
@@ -852,7 +920,8 @@ class MainWindow(QMainWindow):
             print(f"{transform_name} ({transform_id}): {status}")
         
         self.processing_rows.add(row_idx)
-        worker = self.trans_manager.add_row_to_queue(row_idx, df, sorted_transforms)
+        # An explicit click regenerates rather than replaying cached LLM output
+        worker = self.trans_manager.add_row_to_queue(row_idx, df, sorted_transforms, refresh_cache=True)
         self._connect_worker_signals(worker) 
         self._update_row_style(row_idx, "processing")
     def _connect_worker_signals(self, worker):
@@ -866,7 +935,7 @@ class MainWindow(QMainWindow):
     def _handle_transform_finish(self, row_idx, new_data):
         """Update the DataFrame after transformations, handling new columns."""
         try:
-            df = self.df_model.dataFrame().copy()
+            df = self.df_model.dataFrame()
 
             # Check for new columns added during transformation
             new_columns = new_data.index.difference(df.columns)
@@ -907,7 +976,7 @@ class MainWindow(QMainWindow):
 
     def get_sorted_transformations(self):
         """Sort transformations by their output column's position."""
-        df = self.df_model.dataFrame()
+        df = self.df_model.dataFrameView()
         transformations = []
         for transform_id, meta in self.trans_manager.get_metadata()["transformations"].items():
             output_col = meta.get("output_col")
@@ -9,7 +9,7 @@ from services.settings_service import (
     get_resume_text, set_resume_text,
     get_email_account, set_email_account,
     get_email_password, set_email_password,
-    load_env_vars, get_env_var, set_env_var
+    batched_settings, load_env_vars, get_env_var, set_env_var
 )
 # Import your transformation discovery method
 from transformations.utils import find_transformations_in_package
@@ -174,10 +174,11 @@ class SettingsDialog(QDialog):
         Then proceed with saving the normal settings.
         """
         # 1) Save personal & email & env settings
-        set_linkedin_url(self.linkedin_edit.text().strip())
-        set_resume_text(self.resume_edit.toPlainText().strip())
-        set_email_account(self.email_account_edit.text().strip())
-        set_email_password(self.email_password_edit.text())
+        with batched_settings() as settings:
+            set_linkedin_url(self.linkedin_edit.text().strip(), settings=settings)
+            set_resume_text(self.resume_edit.toPlainText().strip(), settings=settings)
+            set_email_account(self.email_account_edit.text().strip(), settings=settings)
+            set_email_password(self.email_password_edit.text(), settings=settings)
 
         set_env_var("OPENAI_API_KEY", self.openai_api_edit.text().strip())
         set_env_var("ANTHROPIC_API_KEY", self.anthropic_api_edit.text().strip())